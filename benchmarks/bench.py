@@ -0,0 +1,240 @@
+# Benchmarks de las etapas del pipeline sobre datos sintéticos.
+#
+# Para cada escala genera un CSV con benchmarks/sintetico.py y mide la
+# lectura con el esquema, la limpieza, la imputación, las métricas
+# derivadas, el top-N, el modo por lotes y el dibujo de cada figura. Guarda los
+# resultados en JSON; con --comparar se contrastan contra una corrida
+# anterior y se marcan las etapas que empeoraron.
+#
+# También mide el arranque en frío de los comandos de cli.py que no dibujan
+# (un proceso nuevo por repetición, sobre una copia de states.csv en un
+# directorio temporal) y anota si alguno llegó a importar pandas o
+# matplotlib. `process` se mide dos veces: con el artefacto al día (sale sin
+# procesar) y forzando el procesamiento completo.
+#
+#     python -m benchmarks.bench --escalas 52,100000,1000000 --salida bench.json
+#     python -m benchmarks.bench --comparar bench_anterior.json
+import argparse
+import json
+import os
+import platform
+import re
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.sintetico import generar
+from pact.metrics import METRICAS_EXPORTADAS, evaluar
+from pact.pipeline import estadisticas_imputacion, imputar, limpiar, procesar_por_lotes
+from pact.ranking import top_n
+from pact.schema import leer_csv
+
+# Arriba de este número de filas no se miden las figuras: una barra o un
+# punto por fila deja de tener sentido mucho antes que el resto del pipeline
+MAX_FILAS_FIGURAS = 5_000
+
+# Una etapa es regresión si tarda más que esto veces la corrida base
+UMBRAL_REGRESION = 1.25
+
+# Comandos de cli.py cuyo arranque se mide (nombre -> argumentos); ninguno
+# debe cargar matplotlib
+COMANDOS_ARRANQUE = {
+    "--help": ["--help"],
+    "stats": ["stats"],
+    "process (al día)": ["process"],
+    "process (completo)": ["process", "--forzar"],
+}
+MODULOS_PESADOS = ["pandas", "matplotlib"]
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def medir(funcion, repeticiones):
+    """Ejecuta `funcion` varias veces; devuelve (tiempos, último resultado)."""
+    tiempos = []
+    resultado = None
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        resultado = funcion()
+        tiempos.append(time.perf_counter() - inicio)
+    return tiempos, resultado
+
+
+def resumen(tiempos, filas):
+    minimo = min(tiempos)
+    return {
+        "segundos_min": minimo,
+        "segundos_mediana": statistics.median(tiempos),
+        "repeticiones": len(tiempos),
+        "filas_por_segundo": filas / minimo if minimo > 0 else None,
+    }
+
+
+def medir_escala(ruta, filas, repeticiones, figuras, directorio):
+    etapas = {}
+
+    tiempos, dataset = medir(lambda: leer_csv(ruta), repeticiones)
+    etapas["carga"] = resumen(tiempos, filas)
+
+    tiempos, _ = medir(lambda: limpiar(dataset.copy()), repeticiones)
+    etapas["limpieza"] = resumen(tiempos, filas)
+    limpiar(dataset)
+
+    tiempos, _ = medir(lambda: imputar(dataset.copy(), estadisticas_imputacion(dataset)), repeticiones)
+    etapas["imputacion"] = resumen(tiempos, filas)
+    imputar(dataset, estadisticas_imputacion(dataset))
+
+    # Cada repetición usa una copia para que la memoización no oculte el costo
+    tiempos, _ = medir(lambda: evaluar(dataset.copy(deep=False), METRICAS_EXPORTADAS), repeticiones)
+    etapas["metricas"] = resumen(tiempos, filas)
+    for nombre, valores in evaluar(dataset, METRICAS_EXPORTADAS).items():
+        dataset[nombre] = valores
+
+    # Top 15 por selección parcial, sin índice (ver ranking.py)
+    tiempos, _ = medir(lambda: top_n(dataset['Annual Tax Credit Expenditure'], 15), repeticiones)
+    etapas["top_n"] = resumen(tiempos, filas)
+
+    salida_lotes = os.path.join(directorio, "lotes.csv")
+    tiempos, _ = medir(lambda: procesar_por_lotes(ruta, salida_lotes, 100_000), repeticiones)
+    etapas["por_lotes"] = resumen(tiempos, filas)
+
+    if figuras and filas <= MAX_FILAS_FIGURAS:
+        # Solo aquí se importa matplotlib
+        import matplotlib
+
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+
+        from pact.visualization import FIGURAS, us_state_to_abbrev
+
+        dataset["State_Abbrev"] = dataset["State"].map(us_state_to_abbrev)
+        for numero in figuras:
+            funcion, nombre = FIGURAS[numero]
+
+            def dibujar():
+                fig = funcion(dataset)
+                fig.savefig(os.path.join(directorio, nombre), dpi=300)
+                plt.close(fig)
+
+            tiempos, _ = medir(dibujar, repeticiones)
+            etapas[f"figura_{numero}"] = resumen(tiempos, filas)
+
+    return etapas
+
+
+def medir_arranque(comandos=COMANDOS_ARRANQUE, repeticiones=5):
+    """Tiempo de `python -m pact <comando>` en un proceso nuevo y los módulos
+    pesados que llegó a importar.
+
+    Los comandos corren en un directorio temporal con una copia de
+    states.csv, así no reescriben el CSV procesado ni el artefacto del
+    repositorio. Antes de medir se procesa una vez, para que `stats` y
+    `process (al día)` encuentren el artefacto al día.
+    """
+    entorno = dict(os.environ)
+    entorno["PYTHONPATH"] = os.pathsep.join(filter(None, [RAIZ, entorno.get("PYTHONPATH")]))
+    arranque = {}
+    with tempfile.TemporaryDirectory() as directorio:
+        shutil.copy(os.path.join(RAIZ, "states.csv"), directorio)
+
+        def lanzar(argumentos, *opciones):
+            return subprocess.run([sys.executable, *opciones, "-m", "pact", *argumentos], cwd=directorio,
+                                  env=entorno, check=True, capture_output=True, text=True)
+
+        lanzar(["process"])
+        for nombre, argumentos in comandos.items():
+            tiempos, _ = medir(lambda: lanzar(argumentos), repeticiones)
+            # -X importtime lista en stderr cada módulo importado
+            importados = lanzar(argumentos, "-X", "importtime").stderr
+            arranque[nombre] = resumen(tiempos, 1)
+            arranque[nombre]["modulos_pesados"] = [
+                modulo for modulo in MODULOS_PESADOS if re.search(rf"\|\s+{modulo}$", importados, re.MULTILINE)
+            ]
+            print(f"  {'pact ' + nombre:<24} {min(tiempos):>9.4f} s  {', '.join(arranque[nombre]['modulos_pesados'])}")
+    return arranque
+
+
+def correr(escalas, repeticiones=3, figuras=None, semilla=0):
+    resultados = {
+        "fecha": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": sys.version.split()[0],
+        "plataforma": platform.platform(),
+        "cpus": os.cpu_count(),
+        "versiones": {"numpy": np.__version__, "pandas": pd.__version__},
+        "semilla": semilla,
+        "escalas": [],
+    }
+    with tempfile.TemporaryDirectory() as directorio:
+        for filas in escalas:
+            ruta = os.path.join(directorio, f"sintetico_{filas}.csv")
+            generar(ruta, filas, semilla)
+            print(f"Escala {filas:,} filas ({os.path.getsize(ruta) / 1e6:,.1f} MB)")
+            etapas = medir_escala(ruta, filas, repeticiones, figuras, directorio)
+            for etapa, datos in etapas.items():
+                print(f"  {etapa:<12} {datos['segundos_min']:>9.4f} s")
+            resultados["escalas"].append({"filas": filas, "etapas": etapas})
+            os.remove(ruta)
+
+    print("Arranque en frío")
+    resultados["arranque"] = medir_arranque(repeticiones=max(repeticiones, 5))
+    return resultados
+
+
+def comparar(actual, base, umbral=UMBRAL_REGRESION):
+    """Lista de (filas, etapa, razón) de las etapas que empeoraron."""
+    anteriores = {escala["filas"]: escala["etapas"] for escala in base["escalas"]}
+    # El arranque se compara como una escala más, con 0 filas
+    anteriores[0] = base.get("arranque", {})
+    regresiones = []
+    for escala in actual["escalas"] + [{"filas": 0, "etapas": actual.get("arranque", {})}]:
+        for etapa, datos in escala["etapas"].items():
+            anterior = anteriores.get(escala["filas"], {}).get(etapa)
+            if anterior is None:
+                continue
+            razon = datos["segundos_min"] / anterior["segundos_min"]
+            print(f"{escala['filas']:>12,} {etapa:<12} x{razon:.2f}")
+            if razon > umbral:
+                regresiones.append((escala["filas"], etapa, razon))
+    return regresiones
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks del pipeline con datos sintéticos.")
+    parser.add_argument("--escalas", default="52,10000,100000", help="filas por escala, separadas por coma")
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument("--figures", default="all", help="figuras a medir (ej. 1,5) o 'none'")
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--salida", default="bench.json")
+    parser.add_argument("--comparar", help="JSON de una corrida anterior")
+    args = parser.parse_args(argv)
+
+    escalas = [int(parte) for parte in args.escalas.split(",") if parte.strip()]
+    if args.figures == "none":
+        figuras = []
+    elif args.figures == "all":
+        figuras = list(range(1, 10))
+    else:
+        figuras = [int(parte) for parte in args.figures.split(",") if parte.strip()]
+
+    resultados = correr(escalas, args.repeticiones, figuras, args.semilla)
+    with open(args.salida, "w", encoding="utf-8") as archivo:
+        json.dump(resultados, archivo, indent=2)
+    print(f"Resultados en {args.salida}")
+
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as archivo:
+            regresiones = comparar(resultados, json.load(archivo))
+        for filas, etapa, razon in regresiones:
+            print(f"REGRESIÓN: {etapa} con {filas:,} filas tarda x{razon:.2f}")
+        if regresiones:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
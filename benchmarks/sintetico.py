@@ -0,0 +1,103 @@
+# Generador de datos sintéticos con el formato exacto de states.csv.
+#
+# Escribe porcentajes como '14.6%' y ' -4.5% ', montos como '$310 ', nombres
+# con espacios al final y deja vacíos algunos valores de Medicaid 2013 y de
+# la expansión de Medicaid, igual que el archivo original. Con la misma
+# semilla y el mismo número de filas el archivo sale idéntico.
+#
+#     python -m benchmarks.sintetico sintetico.csv --filas 1000000
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from pact.schema import ESQUEMA
+
+ESTADOS = [
+    "Alabama", "Alaska", "Arizona", "Arkansas", "California", "Colorado", "Connecticut", "Delaware",
+    "District of Columbia", "Florida", "Georgia", "Hawaii", "Idaho", "Illinois", "Indiana", "Iowa",
+    "Kansas", "Kentucky", "Louisiana", "Maine", "Maryland", "Massachusetts", "Michigan", "Minnesota",
+    "Mississippi", "Missouri", "Montana", "Nebraska", "Nevada", "New Hampshire", "New Jersey",
+    "New Mexico", "New York", "North Carolina", "North Dakota", "Ohio", "Oklahoma", "Oregon",
+    "Pennsylvania", "Rhode Island", "South Carolina", "South Dakota", "Tennessee", "Texas", "Utah",
+    "Vermont", "Virginia", "Washington", "West Virginia", "Wisconsin", "Wyoming", "United States",
+]
+
+# Filas por bloque al escribir; cada bloque tiene su propio flujo aleatorio
+# derivado de la semilla, así que el resultado no depende de la memoria
+FILAS_POR_BLOQUE = 250_000
+
+
+def _nombres(inicio, n):
+    indices = np.arange(inicio, inicio + n)
+    base = np.array(ESTADOS, dtype=object)[indices % len(ESTADOS)]
+    vuelta = indices // len(ESTADOS)
+    # A partir de la segunda vuelta se numeran: 'Alabama #2'
+    sufijo = np.where(vuelta > 0, np.char.mod(" #%d", vuelta + 1).astype(object), "")
+    return base + sufijo
+
+
+def generar_bloque(rng, inicio, n):
+    """DataFrame con `n` filas ya formateadas como en states.csv."""
+    tasa_2010 = rng.uniform(4, 25, n).round(1)
+    tasa_2015 = (tasa_2010 - rng.uniform(0.5, 11, n)).clip(2, None).round(1)
+    cambio = (tasa_2015 - tasa_2010).round(1)
+
+    empleador = rng.integers(200_000, 20_000_000, n)
+    marketplace = (empleador * rng.uniform(0.01, 0.12, n)).astype(np.int64)
+    creditos = (marketplace * rng.uniform(0.6, 0.95, n)).astype(np.int64)
+    credito_mensual = rng.integers(150, 800, n)
+    medicaid_2013 = (empleador * rng.uniform(0.1, 0.6, n)).astype(np.int64)
+    medicaid_2016 = (medicaid_2013 * rng.uniform(0.95, 1.6, n)).astype(np.int64)
+    medicare = (empleador * rng.uniform(0.2, 0.5, n)).astype(np.int64)
+
+    falta_medicaid = rng.random(n) < 0.04
+    falta_expansion = rng.random(n) < 0.02
+    expansion = np.where(rng.random(n) < 0.6, "True", "False").astype(object)
+    expansion[falta_expansion] = ""
+
+    medicaid_2013_texto = medicaid_2013.astype(str).astype(object)
+    medicaid_2013_texto[falta_medicaid] = ""
+    cambio_medicaid = (medicaid_2016 - medicaid_2013).astype(str).astype(object)
+    cambio_medicaid[falta_medicaid] = ""
+
+    espacio = np.where(rng.random(n) < 0.7, " ", "").astype(object)
+    columnas = list(ESQUEMA)
+    return pd.DataFrame({
+        columnas[0]: _nombres(inicio, n) + espacio,
+        columnas[1]: np.char.mod("%.1f%%", tasa_2010),
+        columnas[2]: np.char.mod("%.1f%%", tasa_2015),
+        columnas[3]: np.char.mod(" %.1f%% ", cambio),
+        columnas[4]: (empleador * rng.uniform(0.01, 0.1, n)).astype(np.int64),
+        columnas[5]: empleador,
+        columnas[6]: marketplace,
+        columnas[7]: creditos,
+        columnas[8]: np.char.mod("$%d ", credito_mensual),
+        columnas[9]: expansion,
+        columnas[10]: medicaid_2013_texto,
+        columnas[11]: medicaid_2016,
+        columnas[12]: cambio_medicaid,
+        columnas[13]: medicare,
+    })
+
+
+def generar(ruta, filas, semilla=0):
+    """Escribe `filas` filas sintéticas en `ruta`, bloque por bloque."""
+    n_bloques = max(1, -(-filas // FILAS_POR_BLOQUE))
+    flujos = np.random.SeedSequence(semilla).spawn(n_bloques)
+    for i, flujo in enumerate(flujos):
+        inicio = i * FILAS_POR_BLOQUE
+        n = min(FILAS_POR_BLOQUE, filas - inicio)
+        bloque = generar_bloque(np.random.default_rng(flujo), inicio, n)
+        bloque.to_csv(ruta, index=False, mode="w" if i == 0 else "a", header=(i == 0))
+    return ruta
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Genera un CSV sintético con el formato de states.csv.")
+    parser.add_argument("ruta")
+    parser.add_argument("--filas", type=int, default=52)
+    parser.add_argument("--semilla", type=int, default=0)
+    args = parser.parse_args()
+
+    generar(args.ruta, args.filas, args.semilla)
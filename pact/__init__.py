@@ -0,0 +1,4 @@
+# Pipeline y figuras del dataset de seguros médicos por estado.
+#
+# No importa nada al cargarse: cada módulo trae lo suyo (pandas, matplotlib)
+# cuando se usa, así `pact stats` o `pact --help` arrancan rápido (ver cli.py).
@@ -0,0 +1,6 @@
+import sys
+
+from .cli import main
+
+# `python -m pact ...` equivale al comando `pact` instalado
+sys.exit(main())
@@ -0,0 +1,234 @@
+import contextlib
+import hashlib
+import json
+import os
+import shutil
+
+import numpy as np
+
+# Artefacto columnar que processing.py deja para visualization.py: un
+# directorio con un .npy por columna (se abren con memory-map, sin parsear
+# texto) y un meta.json con el orden, los tipos y el hash del CSV de origen.
+# El CSV procesado lleva un registro aparte (<salida>.meta.json) con el mismo
+# hash y las métricas con las que se escribió, porque el artefacto se puede
+# regenerar (cargar_procesado) sin volver a escribir el CSV.
+#
+# Junto al hash se guarda la huella del origen (tamaño y fecha de
+# modificación): si no cambió, se reutiliza el hash guardado en vez de volver
+# a leer el archivo entero, que en extractos de varios GB es lo que más tarda.
+#
+# pandas (y con él el pipeline) se importa dentro de las funciones que lo
+# usan: revisar si el artefacto está al día o leer sus columnas crudas solo
+# necesita numpy, y así los comandos rápidos de cli.py arrancan en menos
+# tiempo.
+DIRECTORIO_ARTEFACTO = "states_processed.cols"
+VERSION_ARTEFACTO = 2
+
+
+def hash_archivo(ruta, tamano_bloque=1 << 20):
+    """SHA-256 del contenido de un archivo, leído por bloques."""
+    h = hashlib.sha256()
+    with open(ruta, "rb") as archivo:
+        for bloque in iter(lambda: archivo.read(tamano_bloque), b""):
+            h.update(bloque)
+    return h.hexdigest()
+
+
+def huella_archivo(ruta):
+    """[tamaño, fecha de modificación en ns] de un archivo."""
+    estado = os.stat(ruta)
+    return [estado.st_size, estado.st_mtime_ns]
+
+
+def hash_con_huella(origen, registro=None):
+    """(hash, huella) de `origen`. Si la huella coincide con la de `registro`
+    (un meta.json), devuelve el hash guardado sin leer el archivo."""
+    huella = huella_archivo(origen)
+    if registro is not None and registro.get("huella_origen") == huella:
+        return registro["hash_origen"], huella
+    return hash_archivo(origen), huella
+
+
+def _escribir_json(ruta, datos):
+    with open(ruta + ".tmp", "w", encoding="utf-8") as archivo:
+        json.dump(datos, archivo, ensure_ascii=False, indent=2)
+    os.replace(ruta + ".tmp", ruta)
+
+
+def _leer_json(ruta):
+    try:
+        with open(ruta, encoding="utf-8") as archivo:
+            return json.load(archivo)
+    except (OSError, ValueError):
+        return None
+
+
+def _vigente(registro, origen, metricas, ruta):
+    """True si `registro` (guardado en `ruta`) corresponde al `origen` actual
+    y a estas métricas. Si el contenido es el mismo pero cambió la huella (el
+    archivo se copió o se tocó), la actualiza para la próxima vez."""
+    if registro is None or registro.get("metricas") != metricas:
+        return False
+    hash_actual, huella = hash_con_huella(origen, registro)
+    if registro["hash_origen"] != hash_actual:
+        return False
+    if registro.get("huella_origen") != huella:
+        registro["huella_origen"] = huella
+        with contextlib.suppress(OSError):
+            _escribir_json(ruta, registro)
+    return True
+
+def codificar_columna(serie):
+    """(info, datos, máscara o None) de una columna, con datos en un arreglo
+    numpy contiguo. Las columnas de texto pasan a categóricas (códigos +
+    categorías) y los booleanos y enteros con nulos llevan una máscara aparte.
+    """
+    import pandas as pd
+
+    info = {"nombre": serie.name}
+    mascara = None
+    if isinstance(serie.dtype, pd.CategoricalDtype) or serie.dtype == object or pd.api.types.is_string_dtype(serie):
+        categorica = serie.astype("category")
+        info["tipo"] = "categoria"
+        info["categorias"] = [str(c) for c in categorica.cat.categories]
+        datos = categorica.cat.codes.to_numpy()
+    elif pd.api.types.is_bool_dtype(serie):
+        info["tipo"] = "booleano"
+        nulos = serie.isna().to_numpy()
+        if nulos.any():
+            mascara = nulos
+        datos = serie.to_numpy(dtype=bool, na_value=False)
+    elif pd.api.types.is_extension_array_dtype(serie.dtype) and serie.hasnans:
+        # Enteros con nulos (Int32, ...): valores + máscara
+        info["tipo"] = "numerico"
+        mascara = serie.isna().to_numpy()
+        datos = serie.to_numpy(dtype=serie.dtype.numpy_dtype, na_value=0)
+    else:
+        info["tipo"] = "numerico"
+        datos = serie.to_numpy(dtype=getattr(serie.dtype, "numpy_dtype", None))
+    return info, np.ascontiguousarray(datos), mascara
+
+
+def decodificar_columna(info, datos, mascara=None):
+    """Inverso de codificar_columna: el arreglo que va en el DataFrame, sin
+    copiar `datos` salvo en las columnas con máscara."""
+    import pandas as pd
+
+    if info["tipo"] == "categoria":
+        return pd.Categorical.from_codes(datos, info["categorias"])
+    if mascara is not None and info["tipo"] == "booleano":
+        return pd.arrays.BooleanArray(np.asarray(datos), mascara)
+    if mascara is not None:
+        return pd.arrays.IntegerArray(np.asarray(datos), mascara)
+    return datos
+
+
+def escribir_artefacto(dataset, hash_origen, directorio=DIRECTORIO_ARTEFACTO, huella_origen=None, metricas=None):
+    """Guarda cada columna de `dataset` como un .npy tipado (ver
+    codificar_columna). `metricas` es la lista pedida a procesar_dataset, o
+    None para las de siempre."""
+    temporal = directorio + ".tmp"
+    shutil.rmtree(temporal, ignore_errors=True)
+    os.makedirs(temporal)
+
+    columnas = []
+    for i, nombre in enumerate(dataset.columns):
+        info, datos, mascara = codificar_columna(dataset[nombre])
+        info["archivo"] = f"c{i:03d}.npy"
+        np.save(os.path.join(temporal, info["archivo"]), datos)
+        if mascara is not None:
+            info["mascara"] = f"c{i:03d}_na.npy"
+            np.save(os.path.join(temporal, info["mascara"]), mascara)
+        columnas.append(info)
+
+    meta = {
+        "version": VERSION_ARTEFACTO,
+        "hash_origen": hash_origen,
+        "huella_origen": huella_origen,
+        "metricas": metricas,
+        "filas": len(dataset),
+        "columnas": columnas,
+    }
+    _escribir_json(os.path.join(temporal, "meta.json"), meta)
+
+    shutil.rmtree(directorio, ignore_errors=True)
+    os.replace(temporal, directorio)
+
+
+def leer_meta(directorio=DIRECTORIO_ARTEFACTO):
+    """meta.json del artefacto, o None si no existe o es de otra versión."""
+    meta = _leer_json(os.path.join(directorio, "meta.json"))
+    if meta is None or meta.get("version") != VERSION_ARTEFACTO:
+        return None
+    return meta
+
+
+def al_dia(origen="states.csv", directorio=DIRECTORIO_ARTEFACTO, metricas=None):
+    """True si el artefacto existe y se generó a partir del `origen` actual
+    con estas métricas (None: las de siempre)."""
+    return _vigente(leer_meta(directorio), origen, metricas, os.path.join(directorio, "meta.json"))
+
+
+def ruta_registro_csv(salida):
+    return salida + ".meta.json"
+
+
+def registrar_csv(salida, hash_origen, huella_origen, metricas=None):
+    """Anota de qué origen y con qué métricas se escribió el CSV `salida`."""
+    _escribir_json(ruta_registro_csv(salida), {
+        "hash_origen": hash_origen,
+        "huella_origen": huella_origen,
+        "metricas": metricas,
+        "huella_salida": huella_archivo(salida),
+    })
+
+
+def csv_al_dia(origen, salida, metricas=None):
+    """True si `salida` es el CSV que registrar_csv anotó (no se modificó
+    después) y corresponde al `origen` actual con estas métricas."""
+    registro = _leer_json(ruta_registro_csv(salida))
+    try:
+        if registro is None or registro.get("huella_salida") != huella_archivo(salida):
+            return False
+    except OSError:
+        return False
+    return _vigente(registro, origen, metricas, ruta_registro_csv(salida))
+
+
+def columnas_crudas(directorio=DIRECTORIO_ARTEFACTO, mmap=True):
+    """Itera (info, datos, máscara o None) por columna sin construir el
+    DataFrame; las categóricas dan sus códigos."""
+    meta = leer_meta(directorio)
+    if meta is None:
+        raise FileNotFoundError(f"No hay un artefacto válido en {directorio!r}")
+    modo = "r" if mmap else None
+    for info in meta["columnas"]:
+        datos = np.load(os.path.join(directorio, info["archivo"]), mmap_mode=modo)
+        mascara = np.load(os.path.join(directorio, info["mascara"])) if "mascara" in info else None
+        yield info, datos, mascara
+
+
+def leer_artefacto(directorio=DIRECTORIO_ARTEFACTO, mmap=True):
+    """Reconstruye el DataFrame a partir de los .npy (con memory-map)."""
+    import pandas as pd
+
+    columnas = {info["nombre"]: decodificar_columna(info, datos, mascara)
+                for info, datos, mascara in columnas_crudas(directorio, mmap)}
+    return pd.DataFrame(columnas, copy=False)
+
+
+def cargar_procesado(origen="states.csv", directorio=DIRECTORIO_ARTEFACTO):
+    """Devuelve el dataset procesado desde el artefacto.
+
+    Si el artefacto no existe, fue generado a partir de otra versión de
+    `origen` (el hash no coincide) o con otras métricas, se vuelve a procesar
+    y se reescribe.
+    """
+    from .compact import compactar
+    from .pipeline import procesar_dataset
+
+    if not al_dia(origen, directorio):
+        print(f"Artefacto {directorio!r} ausente o desactualizado; reprocesando {origen!r}")
+        hash_actual, huella = hash_con_huella(origen)
+        escribir_artefacto(compactar(procesar_dataset(origen)), hash_actual, directorio, huella)
+    return leer_artefacto(directorio)
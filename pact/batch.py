@@ -0,0 +1,214 @@
+import argparse
+import contextlib
+import csv
+import json
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+from .artifact import hash_archivo
+
+# Reportes en lote: el mismo procesamiento + las nueve figuras para muchos
+# archivos (un extracto anual de HHS, una subpoblación, ...), cada uno en su
+# propia carpeta.
+#
+# El manifiesto es un CSV con una columna `entrada` (rutas relativas al
+# propio manifiesto) y, opcionalmente, `nombre` para la carpeta de salida:
+#
+#     nombre,entrada
+#     2016,extractos/states_2016.csv
+#     2017,extractos/states_2017.csv
+#
+# Cada trabajo corre entero en un proceso de un pool acotado (como
+# `pact build` con un solo proceso: sin CSV intermedio) y su salida de texto
+# va a registro.txt dentro de su carpeta. Un trabajo que falla deja
+# error.txt con la traza y no detiene a los demás. Al terminar bien se
+# escribe el marcador .pact_lote.json con el hash de la entrada y las
+# opciones; al volver a correr el lote, los trabajos con el marcador al día
+# se omiten, así que un lote interrumpido sigue donde quedó.
+MARCADOR = ".pact_lote.json"
+REGISTRO = "registro.txt"
+ERROR = "error.txt"
+
+
+def leer_manifiesto(ruta):
+    """Lista de trabajos {nombre, entrada} del manifiesto CSV."""
+    base = os.path.dirname(os.path.abspath(ruta))
+    with open(ruta, newline="", encoding="utf-8") as archivo:
+        filas = list(csv.DictReader(archivo))
+    if filas and "entrada" not in filas[0]:
+        raise ValueError(f"El manifiesto {ruta!r} necesita una columna 'entrada'")
+
+    trabajos = []
+    for fila in filas:
+        entrada = (fila["entrada"] or "").strip()
+        if not entrada:
+            continue
+        nombre = (fila.get("nombre") or "").strip() or os.path.splitext(os.path.basename(entrada))[0]
+        trabajos.append({"nombre": nombre, "entrada": os.path.join(base, entrada)})
+
+    nombres = [trabajo["nombre"] for trabajo in trabajos]
+    repetidos = sorted({nombre for nombre in nombres if nombres.count(nombre) > 1})
+    if repetidos:
+        raise ValueError(f"Nombres de salida repetidos en el manifiesto: {repetidos}")
+    return trabajos
+
+
+def _describir(error, maximo=160):
+    """Una línea corta para el progreso; la traza completa queda en error.txt."""
+    texto = f"{type(error).__name__}: {error}"
+    return texto if len(texto) <= maximo else texto[:maximo - 3] + "..."
+
+
+def _escribir_json(ruta, datos):
+    with open(ruta + ".tmp", "w", encoding="utf-8") as archivo:
+        json.dump(datos, archivo, ensure_ascii=False, indent=2)
+    os.replace(ruta + ".tmp", ruta)
+
+
+def al_dia(directorio, hash_entrada, opciones):
+    """True si el marcador de `directorio` corresponde a esta entrada y
+    estas opciones."""
+    try:
+        with open(os.path.join(directorio, MARCADOR), encoding="utf-8") as archivo:
+            marcador = json.load(archivo)
+    except (OSError, ValueError):
+        return False
+    return marcador.get("hash_entrada") == hash_entrada and marcador.get("opciones") == opciones
+
+
+def ejecutar_trabajo(trabajo, directorio, opciones):
+    """Procesa y dibuja un trabajo dentro de un proceso del pool. Nunca
+    lanza: devuelve (nombre, estado, segundos, detalle) con estado 'ok' o
+    'error'."""
+    inicio = time.perf_counter()
+    os.makedirs(directorio, exist_ok=True)
+    with contextlib.suppress(FileNotFoundError):
+        os.remove(os.path.join(directorio, ERROR))
+    try:
+        hash_entrada = hash_archivo(trabajo["entrada"])
+        with open(os.path.join(directorio, REGISTRO), "w", encoding="utf-8") as registro, \
+                contextlib.redirect_stdout(registro):
+            figuras = _procesar_y_dibujar(trabajo["entrada"], directorio, opciones)
+    except Exception as error:
+        with open(os.path.join(directorio, ERROR), "w", encoding="utf-8") as archivo:
+            archivo.write(traceback.format_exc())
+        return trabajo["nombre"], "error", time.perf_counter() - inicio, _describir(error)
+
+    segundos = time.perf_counter() - inicio
+    _escribir_json(os.path.join(directorio, MARCADOR), {
+        "entrada": trabajo["entrada"],
+        "hash_entrada": hash_entrada,
+        "opciones": opciones,
+        "figuras": figuras,
+        "segundos": segundos,
+    })
+    return trabajo["nombre"], "ok", segundos, f"{len(figuras)} archivos"
+
+
+def _procesar_y_dibujar(entrada, directorio, opciones):
+    # Igual que `pact build`, con las figuras en secuencia: el paralelismo
+    # del lote está entre trabajos
+    from . import render
+    from .compact import compactar
+    from .pipeline import METRICAS_EXPORTADAS, procesar_dataset
+    from .visualization import preparar
+
+    dataset = procesar_dataset(entrada, METRICAS_EXPORTADAS)
+    if opciones["csv"]:
+        dataset.to_csv(os.path.join(directorio, "states_processed.csv"), index=False)
+    resultados = render.renderizar_dataset(preparar(compactar(dataset)), opciones["figuras"], directorio, 1,
+                                           opciones["dpi"], formatos=opciones["formatos"])
+    render.reportar(resultados)
+    return [os.path.relpath(ruta, directorio) for _, rutas, _ in resultados for ruta in rutas]
+
+
+def ejecutar_lote(trabajos, salida="lotes", procesos=None, opciones=None, forzar=False, salida_progreso=sys.stdout):
+    """Corre los trabajos en un pool de `procesos` y reporta el avance.
+
+    Devuelve {nombre: (estado, segundos, detalle)} con estado 'ok', 'error'
+    u 'omitido' (marcador al día).
+    """
+    resultados = {}
+    pendientes = []
+    for trabajo in trabajos:
+        directorio = os.path.join(salida, trabajo["nombre"])
+        try:
+            hash_entrada = hash_archivo(trabajo["entrada"])
+        except OSError as error:
+            resultados[trabajo["nombre"]] = ("error", 0.0, _describir(error))
+            continue
+        if not forzar and al_dia(directorio, hash_entrada, opciones):
+            resultados[trabajo["nombre"]] = ("omitido", 0.0, "al día")
+        else:
+            pendientes.append((trabajo, directorio))
+
+    total = len(pendientes)
+    print(f"{len(trabajos)} trabajos: {total} por correr, {len(trabajos) - total} omitidos o inválidos",
+          file=salida_progreso)
+    if not pendientes:
+        return resultados
+
+    procesos = min(procesos or os.cpu_count() or 1, total)
+    inicio = time.perf_counter()
+    hechos = 0
+    with ProcessPoolExecutor(procesos) as pool:
+        futuros = {pool.submit(ejecutar_trabajo, trabajo, directorio, opciones): trabajo["nombre"]
+                   for trabajo, directorio in pendientes}
+        for futuro in as_completed(futuros):
+            nombre = futuros[futuro]
+            try:
+                _, estado, segundos, detalle = futuro.result()
+            except BrokenProcessPool as error:
+                # Un proceso murió (falta de memoria, señal): los trabajos que
+                # quedaban no tienen marcador y se reintentan en la próxima corrida
+                estado, segundos, detalle = "error", 0.0, _describir(error)
+            resultados[nombre] = (estado, segundos, detalle)
+            hechos += 1
+            transcurrido = time.perf_counter() - inicio
+            restante = transcurrido / hechos * (total - hechos)
+            print(f"[{hechos}/{total}] {nombre}: {estado} ({segundos:.1f} s, {detalle}) "
+                  f"- faltan ~{restante:.0f} s", file=salida_progreso, flush=True)
+    return resultados
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Procesa y dibuja las figuras de muchos archivos, cada uno en su carpeta.")
+    parser.add_argument("manifiesto", help="CSV con columnas entrada[,nombre]")
+    parser.add_argument("--salida", default="lotes", help="carpeta base; cada trabajo escribe en salida/nombre")
+    parser.add_argument("--procesos", type=int, default=None, help="trabajos simultáneos (por defecto, uno por CPU)")
+    parser.add_argument("--figures", default="all", help="ej. 1,5,9 (por defecto todas)")
+    parser.add_argument("--dpi", type=int, default=300, help="dpi del PNG principal")
+    parser.add_argument("--formatos", default="png", help="formatos a exportar, separados por coma")
+    parser.add_argument("--csv", action="store_true", help="guarda también el CSV procesado de cada trabajo")
+    parser.add_argument("--forzar", action="store_true", help="vuelve a correr los trabajos ya terminados")
+    args = parser.parse_args(argv)
+
+    from .render import parsear_figuras, parsear_formatos
+
+    opciones = {
+        "figuras": parsear_figuras(args.figures),
+        "formatos": parsear_formatos(args.formatos),
+        "dpi": args.dpi,
+        "csv": args.csv,
+    }
+    inicio = time.perf_counter()
+    resultados = ejecutar_lote(leer_manifiesto(args.manifiesto), args.salida, args.procesos, opciones, args.forzar)
+
+    conteo = {}
+    for estado, _, _ in resultados.values():
+        conteo[estado] = conteo.get(estado, 0) + 1
+    print(f"Lote terminado en {time.perf_counter() - inicio:.1f} s: "
+          + ", ".join(f"{n} {estado}" for estado, n in sorted(conteo.items())))
+    fallidos = sorted(nombre for nombre, (estado, _, _) in resultados.items() if estado == "error")
+    for nombre in fallidos:
+        traza = os.path.join(args.salida, nombre, ERROR)
+        print(f"  {nombre}: {resultados[nombre][2]}" + (f" (ver {traza})" if os.path.exists(traza) else ""))
+    return 1 if fallidos else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
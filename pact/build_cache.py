@@ -0,0 +1,122 @@
+import functools
+import hashlib
+import inspect
+import json
+import os
+import sys
+import types
+
+import pandas as pd
+
+from . import metrics
+
+# Caché de compilación del reporte: por cada archivo de salida guarda el hash
+# de cada columna de la que depende la figura, más el hash del código que la
+# dibuja. Si nada de eso cambió y el PNG sigue ahí, no se vuelve a dibujar.
+#
+# El código incluye, además de la función de la figura, el de los módulos del
+# proyecto que usa su módulo (tilemap, ranking, outliers, ...) y las tablas
+# que define (state_coords, ...): cambiar cualquiera de ellos redibuja.
+ARCHIVO_CACHE = ".pact_build.json"
+
+
+def hash_columna(serie):
+    """Hash del contenido de una columna (independiente del índice)."""
+    h = hashlib.sha256(str(serie.dtype).encode())
+    h.update(pd.util.hash_pandas_object(serie, index=False).to_numpy().tobytes())
+    return h.hexdigest()
+
+
+def hash_codigo(funcion):
+    """Hash del código fuente de la función que dibuja la figura."""
+    try:
+        fuente = inspect.getsource(funcion)
+    except (OSError, TypeError):
+        fuente = funcion.__qualname__
+    return hashlib.sha256(fuente.encode()).hexdigest()
+
+
+def _modulos_locales(modulo):
+    """{nombre: archivo} de `modulo` y de los módulos del proyecto (los que
+    están en su mismo directorio) que usa, directa o indirectamente."""
+    archivo = getattr(modulo, "__file__", None)
+    if archivo is None:
+        return {}
+    directorio = os.path.dirname(os.path.abspath(archivo))
+    encontrados = {}
+    pendientes = [modulo]
+    while pendientes:
+        actual = pendientes.pop()
+        archivo = getattr(actual, "__file__", None)
+        if (actual.__name__ in encontrados or archivo is None
+                or os.path.dirname(os.path.abspath(archivo)) != directorio):
+            continue
+        encontrados[actual.__name__] = archivo
+        for valor in vars(actual).values():
+            if isinstance(valor, types.ModuleType):
+                pendientes.append(valor)
+                continue
+            # Funciones y clases importadas con `from modulo import ...`
+            nombre = getattr(valor, "__module__", None)
+            if isinstance(nombre, str) and nombre in sys.modules:
+                pendientes.append(sys.modules[nombre])
+    return encontrados
+
+
+@functools.lru_cache(maxsize=None)
+def hash_modulos(nombre_modulo):
+    """Hash del código de un módulo y de los módulos del proyecto que usa."""
+    h = hashlib.sha256()
+    for nombre, archivo in sorted(_modulos_locales(sys.modules[nombre_modulo]).items()):
+        h.update(nombre.encode())
+        with open(archivo, "rb") as fuente:
+            h.update(hashlib.sha256(fuente.read()).digest())
+    return h.hexdigest()
+
+
+def hashes_columnas(dataset, columnas):
+    """Hash de cada columna; una métrica que el dataset no trae se representa
+    por su expresión y los hashes de sus columnas de entrada."""
+    hashes = {}
+    for columna in sorted(set(columnas)):
+        if columna in dataset.columns:
+            hashes[columna] = hash_columna(dataset[columna])
+        else:
+            expresion, _ = metrics.METRICAS[columna]
+            h = hashlib.sha256(expresion.encode())
+            for base in metrics.columnas_base([columna]):
+                h.update(hash_columna(dataset[base]).encode())
+            hashes[columna] = h.hexdigest()
+    return hashes
+
+
+def leer_cache(salida):
+    try:
+        with open(os.path.join(salida, ARCHIVO_CACHE), encoding="utf-8") as archivo:
+            return json.load(archivo)
+    except (OSError, ValueError):
+        return {}
+
+
+def escribir_cache(salida, cache):
+    ruta = os.path.join(salida, ARCHIVO_CACHE)
+    with open(ruta + ".tmp", "w", encoding="utf-8") as archivo:
+        json.dump(cache, archivo, ensure_ascii=False, indent=2, sort_keys=True)
+    os.replace(ruta + ".tmp", ruta)
+
+
+def entrada_cache(funcion, columnas, hashes, parametros):
+    """Lo que se compara entre corridas para una figura."""
+    return {
+        "codigo": hash_codigo(funcion),
+        "modulos": hash_modulos(funcion.__module__),
+        "columnas": {columna: hashes[columna] for columna in columnas},
+        "parametros": parametros,
+    }
+
+
+def esta_al_dia(cache, nombre, entrada, salida, archivos=None):
+    """La entrada no cambió y siguen ahí todos los `archivos` (por defecto
+    solo `nombre`)."""
+    archivos = [nombre] if archivos is None else archivos
+    return cache.get(nombre) == entrada and all(os.path.exists(os.path.join(salida, a)) for a in archivos)
@@ -0,0 +1,236 @@
+import argparse
+import os
+import sys
+import time
+
+# Punto de entrada de línea de comandos:
+#
+#     pact process [states.csv] [--lotes 100000]
+#     pact render --figures 1,5
+#     pact build [states.csv] --salida reporte [--csv states_processed.csv]
+#     pact stats
+#     pact serve --puerto 8000
+#     pact scenarios --escenarios 100000
+#     pact batch manifiesto.csv --salida lotes
+#
+# (o `python -m pact ...` sin instalar). Este módulo solo importa la
+# biblioteca estándar: pandas se carga cuando hay que procesar y matplotlib
+# únicamente con `render`, para que los comandos que no dibujan arranquen
+# rápido cuando se llaman muchas veces desde un planificador.
+# benchmarks/bench.py mide ese arranque.
+
+
+def procesar(args):
+    from . import profiling
+    from .artifact import al_dia, csv_al_dia, escribir_artefacto, hash_con_huella, registrar_csv
+
+    if args.traza or args.perfil:
+        profiling.configurar(args.traza, args.perfil)
+
+    if args.lotes:
+        from .pipeline import METRICAS_EXPORTADAS, procesar_por_lotes
+
+        hash_entrada, huella = hash_con_huella(args.entrada)
+        procesar_por_lotes(args.entrada, args.salida, args.lotes, args.metricas or METRICAS_EXPORTADAS)
+        registrar_csv(args.salida, hash_entrada, huella, args.metricas)
+        profiling.volcar()
+        return 0
+
+    # Si el CSV y el artefacto se generaron a partir de este mismo archivo y
+    # con estas métricas, no hay nada que hacer
+    if (not args.forzar and csv_al_dia(args.entrada, args.salida, args.metricas)
+            and al_dia(args.entrada, args.artefacto, args.metricas)):
+        print(f"{args.salida} y {args.artefacto} ya están al día")
+        return 0
+
+    from .compact import compactar
+    from .pipeline import METRICAS_EXPORTADAS, procesar_dataset
+
+    # La huella se toma antes de leer: si el archivo cambia mientras se
+    # procesa, la próxima vez no coincide y se vuelve a calcular el hash
+    hash_entrada, huella = hash_con_huella(args.entrada)
+    with profiling.etapa("procesamiento") as e:
+        dataset = procesar_dataset(args.entrada, args.metricas or METRICAS_EXPORTADAS)
+        e.filas = len(dataset)
+    with profiling.etapa("escritura_csv", len(dataset)):
+        dataset.to_csv(args.salida, index=False)
+        registrar_csv(args.salida, hash_entrada, huella, args.metricas)
+    with profiling.etapa("escritura_artefacto", len(dataset)):
+        escribir_artefacto(compactar(dataset), hash_entrada, args.artefacto, huella, args.metricas)
+    print(f"Procesadas {len(dataset):,} filas -> {args.salida}, {args.artefacto}")
+    profiling.volcar()
+    return 0
+
+
+def construir(args):
+    """process + render en un solo proceso: el dataset procesado pasa a las
+    figuras en memoria (y a los trabajadores por memoria compartida), sin
+    escribir y volver a leer el CSV. El CSV y el artefacto son opcionales."""
+    from . import profiling
+    from .compact import compactar
+    from .pipeline import METRICAS_EXPORTADAS, procesar_dataset
+
+    if args.traza or args.perfil:
+        os.environ["PACT_TRAZA"] = args.traza or ""
+        os.environ["PACT_PERFIL"] = args.perfil or ""
+        profiling.configurar(args.traza, args.perfil)
+
+    # matplotlib y las figuras
+    from . import render
+    from .visualization import preparar
+
+    from .artifact import escribir_artefacto, hash_con_huella, registrar_csv
+
+    figuras = render.parsear_figuras(args.figures)
+    formatos = render.parsear_formatos(args.formatos)
+    inicio = time.perf_counter()
+    if args.csv or args.artefacto:
+        hash_entrada, huella = hash_con_huella(args.entrada)
+    with profiling.etapa("procesamiento") as e:
+        dataset = procesar_dataset(args.entrada, METRICAS_EXPORTADAS)
+        e.filas = len(dataset)
+    if args.csv:
+        with profiling.etapa("escritura_csv", len(dataset)):
+            dataset.to_csv(args.csv, index=False)
+            registrar_csv(args.csv, hash_entrada, huella)
+    dataset = compactar(dataset)
+    if args.artefacto:
+        with profiling.etapa("escritura_artefacto", len(dataset)):
+            escribir_artefacto(dataset, hash_entrada, args.artefacto, huella)
+
+    resultados = render.renderizar_dataset(preparar(dataset), figuras, args.salida, args.procesos, args.dpi,
+                                           incremental=not args.forzar, formatos=formatos)
+    render.reportar(resultados, not args.sin_interpretacion)
+    laterales = [ruta for ruta in (args.csv, args.artefacto) if ruta]
+    print(f"Procesadas {len(dataset):,} filas" + (f" -> {', '.join(laterales)}" if laterales else ""))
+    print(f"Total: {time.perf_counter() - inicio:.2f} s")
+    if profiling.volcar():
+        print(f"Traza en {args.traza}")
+    return 0
+
+
+def lote(args, resto):
+    from .batch import main as main_lote
+
+    return main_lote(resto)
+
+
+def renderizar(args, resto):
+    # Aquí se importan matplotlib y las figuras
+    from .render import main as main_render
+
+    main_render(resto)
+    return 0
+
+
+def servir(args, resto):
+    from .server import main as main_server
+
+    main_server(resto)
+    return 0
+
+
+def escenarios(args, resto):
+    from .scenarios import main as main_escenarios
+
+    main_escenarios(resto)
+    return 0
+
+
+def estadisticas(args):
+    """Resumen por columna leído de los .npy del artefacto, solo con numpy."""
+    import numpy as np
+
+    from .artifact import al_dia, cargar_procesado, columnas_crudas, leer_meta
+
+    if not al_dia(args.origen, args.artefacto):
+        cargar_procesado(args.origen, args.artefacto)
+
+    print(f"{leer_meta(args.artefacto)['filas']:,} filas")
+    print(f"{'columna':<46} {'tipo':<10} {'nulos':>6} {'mínimo':>14} {'media':>14} {'máximo':>14}")
+    for info, datos, mascara in columnas_crudas(args.artefacto):
+        if info["tipo"] == "categoria":
+            nulos = int((datos < 0).sum())
+            print(f"{info['nombre']:<46} {'categoria':<10} {nulos:>6} {len(info['categorias']):>14,} categorías")
+            continue
+        valores = np.asarray(datos, dtype=float)
+        if mascara is not None:
+            valores = valores[~mascara]
+        valores = valores[~np.isnan(valores)]
+        nulos = len(datos) - len(valores)
+        if len(valores) == 0:
+            print(f"{info['nombre']:<46} {info['tipo']:<10} {nulos:>6}")
+            continue
+        print(f"{info['nombre']:<46} {info['tipo']:<10} {nulos:>6} "
+              f"{valores.min():>14,.4g} {valores.mean():>14,.4g} {valores.max():>14,.4g}")
+    return 0
+
+
+def crear_parser():
+    parser = argparse.ArgumentParser(prog="pact", description="Pipeline y figuras del dataset de seguros médicos.")
+    comandos = parser.add_subparsers(dest="comando", required=True)
+
+    process = comandos.add_parser("process", help="limpia, imputa y deriva el CSV; escribe el CSV y el artefacto")
+    process.add_argument("entrada", nargs="?", default="states.csv")
+    process.add_argument("--salida", default="states_processed.csv")
+    process.add_argument("--artefacto", default="states_processed.cols")
+    process.add_argument("--lotes", type=int, help="procesa por lotes de este tamaño (solo escribe el CSV)")
+    process.add_argument("--metricas", type=lambda texto: [m.strip() for m in texto.split(",") if m.strip()],
+                         help="métricas derivadas a escribir, separadas por coma")
+    process.add_argument("--forzar", action="store_true", help="procesa aunque el artefacto esté al día")
+    process.add_argument("--traza", help="guarda tiempos y memoria por etapa (.json o .csv)")
+    process.add_argument("--perfil", help="etapa de la que se guarda un volcado de cProfile")
+
+    build = comandos.add_parser("build", help="procesa y dibuja las figuras en un solo paso, sin CSV intermedio")
+    build.add_argument("entrada", nargs="?", default="states.csv")
+    build.add_argument("--salida", default=".", help="carpeta de las figuras")
+    build.add_argument("--figures", default="all", help="ej. 1,5,9 (por defecto todas)")
+    build.add_argument("--procesos", type=int, default=None)
+    build.add_argument("--dpi", type=int, default=300, help="dpi del PNG principal")
+    build.add_argument("--formatos", default="png", help="formatos a exportar, separados por coma")
+    build.add_argument("--csv", help="además guarda el CSV procesado en esta ruta")
+    build.add_argument("--artefacto", help="además guarda el artefacto columnar en esta carpeta")
+    build.add_argument("--forzar", action="store_true", help="redibuja aunque nada haya cambiado")
+    build.add_argument("--sin-interpretacion", action="store_true")
+    build.add_argument("--traza", help="guarda tiempos y memoria por etapa (.json o .csv)")
+    build.add_argument("--perfil", help="etapa de la que se guarda un volcado de cProfile")
+
+    # Las opciones de render, serve, scenarios y batch las interpreta su propio
+    # módulo (ver `pact render --help`)
+    comandos.add_parser("render", help="dibuja las figuras (ej. --figures 1,5)", add_help=False)
+
+    comandos.add_parser("serve", help="servidor HTTP local que dibuja figuras bajo pedido", add_help=False)
+
+    comandos.add_parser("scenarios", help="escenarios Monte Carlo de recorte de subsidios", add_help=False)
+
+    comandos.add_parser("batch", help="procesa y dibuja cada archivo de un manifiesto en su carpeta", add_help=False)
+
+    stats = comandos.add_parser("stats", help="resumen por columna del dataset procesado")
+    stats.add_argument("--origen", default="states.csv")
+    stats.add_argument("--artefacto", default="states_processed.cols")
+    return parser
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    parser = crear_parser()
+    args, resto = parser.parse_known_args(argv)
+    if args.comando == "render":
+        return renderizar(args, resto)
+    if args.comando == "serve":
+        return servir(args, resto)
+    if args.comando == "scenarios":
+        return escenarios(args, resto)
+    if args.comando == "batch":
+        return lote(args, resto)
+    if resto:
+        parser.error(f"argumentos no reconocidos: {' '.join(resto)}")
+    if args.comando == "process":
+        return procesar(args)
+    if args.comando == "build":
+        return construir(args)
+    return estadisticas(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
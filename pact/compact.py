@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+
+# Representación compacta del dataset en memoria: nombres como categóricas,
+# conteos en el entero más angosto que les cabe y el indicador de expansión
+# como booleano con nulos. Todo eso es sin pérdida, y es lo único que se hace
+# por defecto: el dataset compactado es el que se guarda en el artefacto y el
+# que reciben las figuras, así que las tasas y cocientes siguen en float64.
+# Con `flotantes=True` las tasas pasan además a float32 cuando no cambian más
+# de TOLERANCIA_FLOAT32 (lo usa panel.py).
+
+# Tolerancia relativa para aceptar float32 (tiene ~7 dígitos significativos)
+TOLERANCIA_FLOAT32 = 1e-6
+
+ENTEROS = (np.int8, np.int16, np.int32, np.int64)
+
+
+def memoria(dataset):
+    """Bytes que ocupa el dataset, contando el contenido de los textos."""
+    return int(dataset.memory_usage(deep=True, index=True).sum())
+
+
+def tipo_compacto(valores, flotantes=True):
+    """Tipo NumPy más chico que conserva los valores: enteros sin nulos al
+    entero más angosto y, con `flotantes`, flotantes a float32 mientras no
+    cambien más de TOLERANCIA_FLOAT32; sin `flotantes` quedan en float64."""
+    valores = np.asarray(valores, dtype=float)
+    finitos = valores[np.isfinite(valores)]
+    if finitos.size == 0:
+        return np.dtype(np.float32)
+    if np.array_equal(finitos, np.round(finitos)) and finitos.size == valores.size:
+        # Siempre con signo: las restas entre conteos (cambios) no deben dar la vuelta
+        for tipo in ENTEROS:
+            if np.iinfo(tipo).min <= finitos.min() and finitos.max() <= np.iinfo(tipo).max:
+                return np.dtype(tipo)
+    # float32 es exacto para enteros solo hasta 2**24; arriba de eso los
+    # conteos (con nulos o imputados) se quedan en float64
+    if not flotantes or np.abs(finitos).max() >= 2 ** 24:
+        return np.dtype(np.float64)
+    compactos = finitos.astype(np.float32)
+    if np.allclose(compactos, finitos, rtol=TOLERANCIA_FLOAT32, atol=0):
+        return np.dtype(np.float32)
+    return np.dtype(np.float64)
+
+
+def _es_booleana(serie):
+    if pd.api.types.is_bool_dtype(serie):
+        return True
+    if serie.dtype == object:
+        return serie.dropna().map(type).isin([bool, np.bool_]).all() and serie.notna().any()
+    return False
+
+
+def compactar_columna(serie, flotantes=False):
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        return serie
+    if _es_booleana(serie):
+        return serie.astype("boolean")
+    if pd.api.types.is_numeric_dtype(serie):
+        valores = serie.to_numpy(dtype=float, na_value=np.nan)
+        finitos = valores[~np.isnan(valores)]
+        enteros = finitos.size > 0 and np.array_equal(finitos, np.round(finitos))
+        if enteros and finitos.size < valores.size:
+            # Conteos con nulos: entero con máscara (Int8, Int16, ...)
+            ancho = tipo_compacto(finitos)
+            return serie.astype(ancho.name.capitalize())
+        return serie.astype(tipo_compacto(valores, flotantes))
+    # Texto: sin espacios sobrantes y como categórica
+    return serie.astype(str).str.strip().astype("category")
+
+
+def compactar(dataset, verbose=False, flotantes=False):
+    """Devuelve una copia compacta del dataset (sin pérdida salvo con
+    `flotantes`, ver tipo_compacto).
+
+    Con `verbose` imprime la memoria antes y después.
+    """
+    compacto = pd.DataFrame({columna: compactar_columna(dataset[columna], flotantes) for columna in dataset.columns},
+                            index=dataset.index)
+    if verbose:
+        antes, despues = memoria(dataset), memoria(compacto)
+        print(f"Memoria: {antes:,} -> {despues:,} bytes ({antes / max(despues, 1):.1f}x menos)")
+    return compacto
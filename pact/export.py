@@ -0,0 +1,160 @@
+import hashlib
+import io
+import json
+import os
+
+import matplotlib
+import numpy as np
+from PIL import Image
+
+# Exportación de figuras: cada figura se rasteriza una sola vez (al dpi más
+# alto pedido) y de ese mismo lienzo salen el PNG, la miniatura y el WebP,
+# reescalados con Pillow; el SVG es la única salida que vuelve a recorrer la
+# figura, porque es vectorial.
+#
+# Los bytes codificados se guardan en una caché direccionada por contenido
+# dentro de la carpeta de salida: la clave es el hash de (figura, código,
+# hashes de columnas, parámetros, formato), la misma entrada que usa
+# build_cache.py. Si la clave ya está, la salida se copia de la caché sin
+# dibujar; así volver a una versión anterior de los datos no cuesta nada.
+#
+# El PNG se escribe con Pillow en RGB cuando la figura es opaca (un canal
+# menos que el RGBA de savefig) y con la compresión por defecto de zlib:
+# sale más chico y se codifica más rápido que con savefig. Pillow no agrega
+# fecha ni software, así que los mismos píxeles dan los mismos bytes.
+DIRECTORIO_CACHE = ".pact_export"
+
+# Tope de la caché; al pasarlo se borran las entradas usadas hace más tiempo
+MAX_BYTES_CACHE = 256 * 1024 ** 2
+
+# Formato -> especificación. El dpi None del PNG principal se toma de --dpi
+FORMATOS = {
+    "png": {"extension": "png", "dpi": None},
+    "svg": {"extension": "svg"},
+    "miniatura": {"extension": "png", "dpi": 40, "sufijo": "_mini"},
+    "webp": {"extension": "webp", "dpi": 150, "calidad": 85},
+}
+FORMATOS_DEFECTO = ["png"]
+
+
+def especificacion(formato, dpi=300):
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato desconocido: {formato!r}. Disponibles: {sorted(FORMATOS)}")
+    spec = dict(FORMATOS[formato])
+    if "dpi" in spec and spec["dpi"] is None:
+        spec["dpi"] = dpi
+    return spec
+
+
+def nombre_salida(nombre, formato):
+    """'01_Tasa.png', 'miniatura' -> '01_Tasa_mini.png'"""
+    spec = FORMATOS[formato]
+    return f"{os.path.splitext(nombre)[0]}{spec.get('sufijo', '')}.{spec['extension']}"
+
+
+def claves(entrada, formatos, dpi=300):
+    """Clave de caché de cada formato a partir de la entrada de build_cache."""
+    resultado = {}
+    for formato in formatos:
+        contenido = {"entrada": entrada, "formato": formato, "spec": especificacion(formato, dpi)}
+        texto = json.dumps(contenido, sort_keys=True, ensure_ascii=False)
+        resultado[formato] = hashlib.sha256(texto.encode()).hexdigest()
+    return resultado
+
+
+def ruta_cache(salida, clave, formato):
+    return os.path.join(salida, DIRECTORIO_CACHE, f"{clave}.{FORMATOS[formato]['extension']}")
+
+
+def faltantes(salida, claves_formato):
+    """Formatos cuyos bytes todavía no están en la caché."""
+    return [formato for formato, clave in claves_formato.items()
+            if not os.path.exists(ruta_cache(salida, clave, formato))]
+
+
+def _rasterizar(fig, dpi):
+    original = fig.dpi
+    fig.set_dpi(dpi)
+    try:
+        fig.canvas.draw()
+        rgba = np.asarray(fig.canvas.buffer_rgba())
+        # Sin transparencia, el canal alfa solo ocupa espacio
+        imagen = Image.fromarray(rgba[..., :3] if (rgba[..., 3] == 255).all() else rgba.copy())
+    finally:
+        fig.set_dpi(original)
+    return imagen
+
+
+def codificar(fig, formatos, dpi=300):
+    """{formato: bytes} dibujando la figura una vez por tipo (raster y SVG)."""
+    specs = {formato: especificacion(formato, dpi) for formato in formatos}
+    datos = {}
+
+    rasters = {formato: spec for formato, spec in specs.items() if spec["extension"] != "svg"}
+    if rasters:
+        maximo = max(spec["dpi"] for spec in rasters.values())
+        imagen = _rasterizar(fig, maximo)
+        for formato, spec in rasters.items():
+            escalada = imagen
+            if spec["dpi"] != maximo:
+                ancho, alto = imagen.size
+                tamano = (max(1, round(ancho * spec["dpi"] / maximo)), max(1, round(alto * spec["dpi"] / maximo)))
+                escalada = imagen.resize(tamano, Image.Resampling.LANCZOS)
+            buffer = io.BytesIO()
+            if spec["extension"] == "webp":
+                escalada.save(buffer, "WEBP", quality=spec["calidad"])
+            else:
+                escalada.save(buffer, "PNG", dpi=(spec["dpi"], spec["dpi"]))
+            datos[formato] = buffer.getvalue()
+
+    if any(spec["extension"] == "svg" for spec in specs.values()):
+        # Sin fecha y con ids fijos para que el SVG también sea determinista
+        buffer = io.BytesIO()
+        with matplotlib.rc_context({"svg.hashsalt": "pact"}):
+            fig.savefig(buffer, format="svg", metadata={"Date": None})
+        for formato, spec in specs.items():
+            if spec["extension"] == "svg":
+                datos[formato] = buffer.getvalue()
+    return datos
+
+
+def _escribir(ruta, datos):
+    with open(ruta + ".tmp", "wb") as archivo:
+        archivo.write(datos)
+    os.replace(ruta + ".tmp", ruta)
+
+
+def guardar_en_cache(salida, claves_formato, datos):
+    os.makedirs(os.path.join(salida, DIRECTORIO_CACHE), exist_ok=True)
+    for formato, contenido in datos.items():
+        _escribir(ruta_cache(salida, claves_formato[formato], formato), contenido)
+
+
+def materializar(salida, nombre, claves_formato):
+    """Copia cada formato de la caché a su archivo final. Devuelve las rutas."""
+    rutas = []
+    for formato, clave in claves_formato.items():
+        origen = ruta_cache(salida, clave, formato)
+        with open(origen, "rb") as archivo:
+            datos = archivo.read()
+        # Marca la entrada como usada para la limpieza de la caché
+        os.utime(origen)
+        ruta = os.path.join(salida, nombre_salida(nombre, formato))
+        _escribir(ruta, datos)
+        rutas.append(ruta)
+    return rutas
+
+
+def podar_cache(salida, max_bytes=MAX_BYTES_CACHE):
+    """Borra las entradas usadas hace más tiempo hasta quedar bajo el tope."""
+    directorio = os.path.join(salida, DIRECTORIO_CACHE)
+    try:
+        entradas = [entrada for entrada in os.scandir(directorio) if entrada.is_file()]
+    except FileNotFoundError:
+        return
+    entradas.sort(key=lambda entrada: entrada.stat().st_mtime, reverse=True)
+    total = 0
+    for entrada in entradas:
+        total += entrada.stat().st_size
+        if total > max_bytes:
+            os.remove(entrada.path)
@@ -0,0 +1,153 @@
+import weakref
+
+import numpy as np
+
+# numexpr es opcional: si está instalado, cada métrica se evalúa en un solo
+# recorrido sin arreglos intermedios; si no, con NumPy.
+try:
+    import numexpr
+except ImportError:
+    numexpr = None
+
+# Registro de métricas derivadas: nombre -> (expresión, {alias: columna}).
+# Las entradas pueden ser columnas del dataset u otras métricas registradas.
+METRICAS = {}
+
+# Métricas que processing.py escribe en states_processed.csv y en el
+# artefacto; el resto se calcula solo cuando alguien las pide.
+METRICAS_EXPORTADAS = [
+    'Total Insured Approx',
+    'Public vs Private Risk Index',
+    'Annual Tax Credit Expenditure',
+    'Subsidy Dependence Ratio',
+]
+
+# Resultados ya calculados por dataset (id -> {nombre: arreglo}); la entrada
+# se borra cuando el dataset deja de existir
+_memo = {}
+
+
+def registrar(nombre, expresion, **entradas):
+    """Registra una métrica como expresión sobre alias de columnas."""
+    METRICAS[nombre] = (expresion, entradas)
+
+
+# 1. Aproximación de población total asegurada por estado
+registrar(
+    'Total Insured Approx',
+    "empleador + marketplace + medicaid + medicare",
+    empleador='Employer Health Insurance Coverage (2015)',
+    marketplace='Marketplace Health Insurance Coverage (2016)',
+    medicaid='Medicaid Enrollment (2016)',
+    medicare='Medicare Enrollment (2016)',
+)
+
+# 2. Índice de Riesgo Público vs Privado
+registrar(
+    'Public vs Private Risk Index',
+    "(medicaid + medicare) / (empleador + marketplace)",
+    medicaid='Medicaid Enrollment (2016)',
+    medicare='Medicare Enrollment (2016)',
+    empleador='Employer Health Insurance Coverage (2015)',
+    marketplace='Marketplace Health Insurance Coverage (2016)',
+)
+
+# 3. Gasto Anual Estimado en Subsidios
+registrar(
+    'Annual Tax Credit Expenditure',
+    "creditos * credito_mensual * 12",
+    creditos='Marketplace Tax Credits (2016)',
+    credito_mensual='Average Monthly Tax Credit (2016)',
+)
+
+# 4. Ratio de Dependencia de Subsidios en el Mercado Privado
+registrar(
+    'Subsidy Dependence Ratio',
+    "creditos / marketplace",
+    creditos='Marketplace Tax Credits (2016)',
+    marketplace='Marketplace Health Insurance Coverage (2016)',
+)
+
+# 5. Crecimiento de Medicaid entre 2013 y 2016 (no se exporta)
+registrar(
+    'Medicaid Growth Rate (2013-2016)',
+    "(medicaid_2016 - medicaid_2013) / medicaid_2013",
+    medicaid_2016='Medicaid Enrollment (2016)',
+    medicaid_2013='Medicaid Enrollment (2013)',
+)
+
+
+def columnas_base(nombres):
+    """Columnas del dataset de las que dependen las métricas (recursivo)."""
+    columnas = []
+    for nombre in nombres:
+        if nombre not in METRICAS:
+            columnas.append(nombre)
+            continue
+        for columna in METRICAS[nombre][1].values():
+            for base in columnas_base([columna]):
+                if base not in columnas:
+                    columnas.append(base)
+    return columnas
+
+
+def _como_arreglo(serie):
+    """Columna como arreglo NumPy de 64 bits, para que las multiplicaciones
+    no se desborden si el dataset viene compactado."""
+    arreglo = serie.to_numpy()
+    if arreglo.dtype.kind in "iu":
+        return arreglo.astype(np.int64, copy=False)
+    if arreglo.dtype.kind == "b":
+        return arreglo
+    return arreglo.astype(np.float64, copy=False)
+
+
+def _memo_de(dataset):
+    clave = id(dataset)
+    if clave not in _memo:
+        _memo[clave] = {}
+        weakref.finalize(dataset, _memo.pop, clave, None)
+    return _memo[clave]
+
+
+def _evaluar_expresion(expresion, variables):
+    if numexpr is not None:
+        return numexpr.evaluate(expresion, local_dict=variables)
+    return eval(expresion, {"__builtins__": {}}, variables)
+
+
+def evaluar(dataset, nombres):
+    """Calcula las métricas pedidas y devuelve {nombre: arreglo}.
+
+    Cada columna de entrada se convierte a arreglo una sola vez aunque la
+    usen varias métricas, y los resultados quedan memorizados mientras viva
+    el dataset (si se modifica una columna de entrada, hay que usar un
+    dataset nuevo).
+    """
+    memo = _memo_de(dataset)
+    arreglos = {}
+
+    def resolver(nombre):
+        if nombre in memo:
+            return memo[nombre]
+        if nombre in arreglos:
+            return arreglos[nombre]
+        if nombre in dataset.columns:
+            arreglos[nombre] = _como_arreglo(dataset[nombre])
+            return arreglos[nombre]
+        if nombre not in METRICAS:
+            raise KeyError(f"{nombre!r} no es una columna ni una métrica registrada")
+        expresion, entradas = METRICAS[nombre]
+        variables = {alias: resolver(columna) for alias, columna in entradas.items()}
+        memo[nombre] = _evaluar_expresion(expresion, variables)
+        return memo[nombre]
+
+    return {nombre: resolver(nombre) for nombre in nombres}
+
+
+def con_metricas(dataset, nombres):
+    """Agrega al dataset las métricas pedidas que todavía no tiene."""
+    faltantes = [nombre for nombre in nombres if nombre not in dataset.columns]
+    for nombre, valores in evaluar(dataset, faltantes).items():
+        dataset[nombre] = valores
+    return dataset
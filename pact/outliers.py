@@ -0,0 +1,131 @@
+import numpy as np
+import pandas as pd
+
+from .schema import leer_csv
+
+# Regla IQR para outliers con cuantiles aproximados en una sola pasada.
+# BocetoCuantiles es un sketch tipo KLL: guarda a lo más unos cuantos cientos
+# de valores sin importar cuántos vea, acepta lotes y se puede fusionar con
+# los bocetos de otros procesos. Mientras haya visto menos de `k` valores es
+# exacto y da lo mismo que Series.quantile (interpolación lineal); después,
+# el error en rango es de orden 1/k (con k=200, alrededor de 1% de las filas).
+
+K_DEFECTO = 200
+
+
+class BocetoCuantiles:
+    def __init__(self, k=K_DEFECTO, semilla=0):
+        self.k = k
+        self.n = 0
+        self.niveles = [np.empty(0)]
+        self.rng = np.random.default_rng(semilla)
+
+    def _capacidad(self, nivel):
+        # Los niveles altos (cada valor pesa 2**nivel) guardan más valores
+        profundidad = len(self.niveles) - nivel - 1
+        return max(2, int(np.ceil(self.k * (2 / 3) ** profundidad)))
+
+    def _compactar(self):
+        nivel = 0
+        while nivel < len(self.niveles):
+            valores = self.niveles[nivel]
+            if len(valores) <= self._capacidad(nivel):
+                nivel += 1
+                continue
+            if nivel + 1 == len(self.niveles):
+                self.niveles.append(np.empty(0))
+            valores = np.sort(valores)
+            # Con cantidad impar, un valor se queda en el nivel
+            sobrante = valores[-1:] if len(valores) % 2 else valores[:0]
+            pares = valores[: len(valores) - len(sobrante)]
+            promovidos = pares[self.rng.integers(2)::2]
+            self.niveles[nivel] = sobrante
+            self.niveles[nivel + 1] = np.concatenate([self.niveles[nivel + 1], promovidos])
+            # Al crecer la pila bajan las capacidades; se revisa desde abajo
+            nivel = 0
+
+    def actualizar(self, valores):
+        """Agrega un lote de valores (se ignoran los NaN)."""
+        valores = np.asarray(valores, dtype=float).ravel()
+        valores = valores[~np.isnan(valores)]
+        self.niveles[0] = np.concatenate([self.niveles[0], valores])
+        self.n += len(valores)
+        self._compactar()
+        return self
+
+    def fusionar(self, otro):
+        """Absorbe otro boceto (por ejemplo, el de otro proceso)."""
+        while len(self.niveles) < len(otro.niveles):
+            self.niveles.append(np.empty(0))
+        for nivel, valores in enumerate(otro.niveles):
+            self.niveles[nivel] = np.concatenate([self.niveles[nivel], valores])
+        self.n += otro.n
+        self._compactar()
+        return self
+
+    @property
+    def exacto(self):
+        return len(self.niveles) == 1
+
+    def cuantil(self, q):
+        """Cuantil(es) `q` en [0, 1]."""
+        if self.n == 0:
+            return np.full(np.shape(q), np.nan) if np.ndim(q) else float("nan")
+        if self.exacto:
+            return np.quantile(self.niveles[0], q)
+
+        valores = np.concatenate(self.niveles)
+        pesos = np.concatenate([np.full(len(v), 2.0 ** nivel) for nivel, v in enumerate(self.niveles)])
+        orden = np.argsort(valores, kind="stable")
+        valores, acumulado = valores[orden], np.cumsum(pesos[orden])
+        posiciones = np.searchsorted(acumulado, np.asarray(q) * acumulado[-1], side="left")
+        return valores[np.minimum(posiciones, len(valores) - 1)]
+
+    def limites_iqr(self, factor=1.5):
+        """(inferior, superior) de la regla Q1 - 1.5 IQR, Q3 + 1.5 IQR."""
+        q1, q3 = self.cuantil([0.25, 0.75])
+        iqr = q3 - q1
+        return q1 - factor * iqr, q3 + factor * iqr
+
+
+def marcar_outliers(valores, inferior=None, superior=None):
+    """Arreglo booleano: True donde el valor queda fuera de los límites."""
+    valores = np.asarray(valores, dtype=float)
+    fuera = np.zeros(valores.shape, dtype=bool)
+    if inferior is not None:
+        fuera |= valores < inferior
+    if superior is not None:
+        fuera |= valores > superior
+    return fuera
+
+
+def bocetos_por_grupo(valores, grupos, k=K_DEFECTO, bocetos=None):
+    """Un boceto por grupo; con `bocetos` se actualizan los existentes."""
+    bocetos = {} if bocetos is None else bocetos
+    valores = np.asarray(valores, dtype=float)
+    for grupo, indices in pd.Series(valores).groupby(np.asarray(grupos)).indices.items():
+        if grupo not in bocetos:
+            bocetos[grupo] = BocetoCuantiles(k)
+        bocetos[grupo].actualizar(valores[indices])
+    return bocetos
+
+
+def limites_por_grupo(bocetos, factor=1.5):
+    """DataFrame grupo -> (inferior, superior)."""
+    limites = {grupo: boceto.limites_iqr(factor) for grupo, boceto in bocetos.items()}
+    return pd.DataFrame.from_dict(limites, orient="index", columns=["inferior", "superior"])
+
+
+def marcar_por_grupo(valores, grupos, limites):
+    """Marca outliers usando los límites del grupo de cada fila."""
+    por_fila = limites.reindex(np.asarray(grupos))
+    valores = np.asarray(valores, dtype=float)
+    return (valores < por_fila["inferior"].to_numpy()) | (valores > por_fila["superior"].to_numpy())
+
+
+def boceto_de_archivo(ruta, columna, tamano_lote=100_000, k=K_DEFECTO):
+    """Boceto de una columna leyendo el archivo por lotes, en una pasada."""
+    boceto = BocetoCuantiles(k)
+    for lote in leer_csv(ruta, columnas=[columna], chunksize=tamano_lote):
+        boceto.actualizar(lote[columna].to_numpy(dtype=float, na_value=np.nan))
+    return boceto
@@ -0,0 +1,120 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+from .compact import tipo_compacto
+from .pipeline import procesar_dataset
+
+# Panel en formato largo: una fila por (State, Year) y una columna por
+# medida ("Uninsured Rate", "Medicaid Enrollment", ...). Reemplaza a las
+# columnas anchas con el año en el nombre, como 'Uninsured Rate (2015)'.
+PATRON_ANIO = re.compile(r"^(?P<medida>.+) \((?P<anio>\d{4})\)$")
+
+
+def columnas_por_anio(columnas):
+    """{'Uninsured Rate': {2010: 'Uninsured Rate (2010)', ...}, ...}"""
+    medidas = {}
+    for columna in columnas:
+        coincidencia = PATRON_ANIO.match(columna)
+        if coincidencia:
+            medidas.setdefault(coincidencia["medida"], {})[int(coincidencia["anio"])] = columna
+    return medidas
+
+
+def panel_desde_ancho(dataset, estado="State"):
+    """Convierte el dataset ancho en el panel (State, Year).
+
+    Las columnas de rango, como 'Uninsured Rate Change (2010-2015)', no son
+    de un año y se dejan fuera; se obtienen del panel con `cambio`.
+    """
+    medidas = columnas_por_anio(dataset.columns)
+    anios = np.array(sorted({anio for por_anio in medidas.values() for anio in por_anio}), dtype=np.int16)
+    estados = pd.Categorical(dataset[estado].astype(str))
+    n_estados, n_anios = len(dataset), len(anios)
+
+    columnas = {}
+    for medida, por_anio in medidas.items():
+        # Matriz estados x años llenada columna por columna; los años que
+        # la medida no tiene quedan en NaN
+        matriz = np.full((n_estados, n_anios), np.nan)
+        for j, anio in enumerate(anios):
+            if anio in por_anio:
+                matriz[:, j] = dataset[por_anio[anio]].to_numpy(dtype=float, na_value=np.nan)
+        valores = matriz.ravel()
+        if all(pd.api.types.is_bool_dtype(dataset[columna]) for columna in por_anio.values()):
+            columnas[medida] = pd.array(valores, dtype="boolean")
+        else:
+            columnas[medida] = valores.astype(tipo_compacto(valores))
+
+    indice = pd.MultiIndex.from_arrays(
+        [estados.take(np.repeat(np.arange(n_estados), n_anios)), np.tile(anios, n_estados)],
+        names=["State", "Year"],
+    )
+    panel = pd.DataFrame(columnas, index=indice)
+    # Años en los que ninguna medida tiene dato para el estado
+    return panel[panel.notna().any(axis=1)]
+
+
+def leer_panel_largo(ruta, estado="State", anio="Year"):
+    """Lee un CSV que ya viene en formato largo (una fila por estado y año)."""
+    dataset = pd.read_csv(ruta, dtype={estado: "category", anio: np.int16})
+    dataset[estado] = dataset[estado].cat.rename_categories(lambda nombre: str(nombre).strip())
+    for columna in dataset.columns.drop([estado, anio]):
+        dataset[columna] = dataset[columna].astype(tipo_compacto(dataset[columna]))
+    return dataset.rename(columns={estado: "State", anio: "Year"}).set_index(["State", "Year"]).sort_index()
+
+
+def combinar(*paneles):
+    """Une varios paneles; si un (State, Year) se repite, gana el último."""
+    panel = pd.concat(paneles)
+    panel = panel[~panel.index.duplicated(keep="last")]
+    return panel.sort_index()
+
+
+def cargar_panel(*rutas):
+    """Panel a partir de CSVs con el formato de states.csv (anchos) o ya largos
+    (con columna 'Year')."""
+    paneles = []
+    for ruta in rutas:
+        encabezado = pd.read_csv(ruta, nrows=0).columns
+        if "Year" in encabezado:
+            paneles.append(leer_panel_largo(ruta))
+        else:
+            paneles.append(panel_desde_ancho(procesar_dataset(ruta)))
+    return combinar(*paneles)
+
+
+def serie(panel, medida, estados=None, anios=None):
+    """Tabla años x estados de una medida, lista para graficar."""
+    valores = panel[medida]
+    if estados is not None:
+        valores = valores[valores.index.get_level_values("State").isin(estados)]
+    if anios is not None:
+        valores = valores[valores.index.get_level_values("Year").isin(anios)]
+    tabla = valores.unstack("State").dropna(how="all")
+    if estados is not None:
+        tabla = tabla.reindex(columns=list(estados))
+    return tabla
+
+
+def cambio(panel, medida, desde, hasta):
+    """Cambio de la medida entre dos años, por estado."""
+    tabla = serie(panel, medida, anios=[desde, hasta])
+    return tabla.loc[hasta] - tabla.loc[desde]
+
+
+def pendientes(panel, medida):
+    """Pendiente de mínimos cuadrados (cambio por año) de la medida por
+    estado, calculada con sumas agrupadas y sin recorrer filas."""
+    valores = panel[medida].dropna().astype(float)
+    x = valores.index.get_level_values("Year").to_numpy(dtype=float)
+    y = valores.to_numpy()
+    estados = valores.index.get_level_values("State")
+    sumas = pd.DataFrame({"n": 1.0, "x": x, "y": y, "xy": x * y, "xx": x * x}).groupby(
+        np.asarray(estados), observed=True, sort=True
+    ).sum()
+    denominador = sumas["n"] * sumas["xx"] - sumas["x"] ** 2
+    pendiente = (sumas["n"] * sumas["xy"] - sumas["x"] * sumas["y"]) / denominador.where(denominador != 0)
+    pendiente.index.name = "State"
+    return pendiente
@@ -0,0 +1,147 @@
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from . import profiling
+from .metrics import METRICAS_EXPORTADAS, evaluar
+from .outliers import BocetoCuantiles
+from .schema import leer_csv
+
+# Columnas con valores nulos y la estadística con la que se rellenan
+IMPUTACION = {
+    "Medicaid Enrollment (2013)": "media",
+    "Medicaid Enrollment Change (2013-2016)": "media",
+    "State Medicaid Expansion (2016)": "moda",
+}
+
+
+# Columnas cuyos límites de outliers (regla IQR) se reportan en el modo por lotes
+COLUMNAS_OUTLIERS = ['Medicaid Enrollment (2016)']
+
+
+def limpiar(dataset):
+    """Limpieza que el esquema no cubre: el CSV trae espacios al final de
+    los nombres de los estados."""
+    dataset["State"] = dataset["State"].str.strip()
+    return dataset
+
+
+def estadisticas_imputacion(dataset):
+    """Media o moda de cada columna a imputar, con todo el dataset en memoria."""
+    estadisticas = {}
+    for columna, estadistica in IMPUTACION.items():
+        if estadistica == "media":
+            estadisticas[columna] = dataset[columna].mean()
+        else:
+            estadisticas[columna] = dataset[columna].mode()[0]
+    return estadisticas
+
+
+def estadisticas_imputacion_por_lotes(ruta, tamano_lote, bocetos=None):
+    """Primera pasada sobre el archivo: acumula sumas, conteos y frecuencias
+    por lote para obtener las mismas medias y modas sin cargar el archivo.
+
+    `bocetos` ({columna: BocetoCuantiles}) se actualiza en la misma pasada
+    para obtener los límites de outliers.
+    """
+    bocetos = {} if bocetos is None else bocetos
+    columnas = list(IMPUTACION) + [columna for columna in bocetos if columna not in IMPUTACION]
+    sumas = {columna: 0.0 for columna in IMPUTACION}
+    conteos = {columna: 0 for columna in IMPUTACION}
+    frecuencias = {columna: pd.Series(dtype="int64") for columna in IMPUTACION}
+
+    for lote in leer_csv(ruta, columnas=columnas, chunksize=tamano_lote):
+        for columna, boceto in bocetos.items():
+            boceto.actualizar(lote[columna].to_numpy(dtype=float, na_value=np.nan))
+        for columna, estadistica in IMPUTACION.items():
+            if estadistica == "media":
+                sumas[columna] += lote[columna].sum()
+                conteos[columna] += lote[columna].count()
+            else:
+                frecuencias[columna] = frecuencias[columna].add(
+                    lote[columna].value_counts(), fill_value=0
+                )
+
+    estadisticas = {}
+    for columna, estadistica in IMPUTACION.items():
+        if estadistica == "media":
+            estadisticas[columna] = sumas[columna] / conteos[columna] if conteos[columna] else float("nan")
+        else:
+            # Igual que Series.mode(): ante un empate gana el valor más chico
+            maximo = frecuencias[columna].max()
+            estadisticas[columna] = frecuencias[columna][frecuencias[columna] == maximo].sort_index().index[0]
+    return estadisticas
+
+
+def imputar(dataset, estadisticas):
+    """Rellena los nulos con las estadísticas ya calculadas."""
+    for columna, valor in estadisticas.items():
+        dataset[columna] = dataset[columna].fillna(valor)
+    return dataset
+
+
+def agregar_variables_derivadas(dataset, metricas=METRICAS_EXPORTADAS):
+    """Agrega las variables derivadas pedidas (ver metrics.py). Solo usan
+    valores de la misma fila, así que se pueden aplicar lote por lote."""
+    for nombre, valores in evaluar(dataset, metricas).items():
+        dataset[nombre] = valores
+    return dataset
+
+
+def procesar_dataset(ruta, metricas=METRICAS_EXPORTADAS):
+    """Lee, limpia, imputa y deriva el archivo completo en memoria."""
+    dataset = limpiar(leer_csv(ruta))
+    imputar(dataset, estadisticas_imputacion(dataset))
+    return agregar_variables_derivadas(dataset, metricas)
+
+
+def procesar_por_lotes(entrada, salida, tamano_lote=100_000, metricas=METRICAS_EXPORTADAS):
+    """Procesa `entrada` en lotes de `tamano_lote` filas y los va agregando
+    a `salida`. La memoria depende del tamaño del lote, no del archivo.
+
+    Hace dos pasadas: la primera solo lee las columnas a imputar para
+    calcular medias y modas (y los límites de outliers de
+    COLUMNAS_OUTLIERS); la segunda limpia, imputa, deriva y escribe.
+    """
+    inicio = time.perf_counter()
+    bocetos = {columna: BocetoCuantiles() for columna in COLUMNAS_OUTLIERS}
+    with profiling.etapa("primera_pasada"):
+        estadisticas = estadisticas_imputacion_por_lotes(entrada, tamano_lote, bocetos)
+
+    filas = 0
+    with profiling.etapa("segunda_pasada") as e:
+        for i, lote in enumerate(leer_csv(entrada, chunksize=tamano_lote)):
+            limpiar(lote)
+            imputar(lote, estadisticas)
+            agregar_variables_derivadas(lote, metricas)
+            lote.to_csv(salida, index=False, mode="w" if i == 0 else "a", header=(i == 0))
+            filas += len(lote)
+        e.filas = filas
+
+    for columna, boceto in bocetos.items():
+        inferior, superior = boceto.limites_iqr()
+        print(f"Límites de outliers de {columna!r}: [{inferior:,.2f}, {superior:,.2f}]")
+
+    segundos = time.perf_counter() - inicio
+    print(f"Procesadas {filas:,} filas en {segundos:.2f} s ({filas / max(segundos, 1e-9):,.0f} filas/s)")
+    return filas
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Procesa el CSV de estados por lotes.")
+    parser.add_argument("entrada", nargs="?", default="states.csv")
+    parser.add_argument("salida", nargs="?", default="states_processed.csv")
+    parser.add_argument("--lotes", type=int, default=100_000, help="filas por lote")
+    parser.add_argument("--metricas", default=",".join(METRICAS_EXPORTADAS),
+                        help="métricas derivadas a escribir, separadas por coma")
+    parser.add_argument("--traza", help="guarda tiempos y memoria por etapa (.json o .csv)")
+    parser.add_argument("--perfil", help="etapa de la que se guarda un volcado de cProfile")
+    args = parser.parse_args()
+
+    if args.traza or args.perfil:
+        profiling.configurar(args.traza, args.perfil)
+    metricas = [nombre.strip() for nombre in args.metricas.split(",") if nombre.strip()]
+    procesar_por_lotes(args.entrada, args.salida, args.lotes, metricas)
+    profiling.volcar()
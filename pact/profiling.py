@@ -0,0 +1,140 @@
+import cProfile
+import csv
+import json
+import os
+import time
+import tracemalloc
+
+# Instrumentación opcional por etapa: tiempo de reloj, tiempo de CPU, pico de
+# memoria (tracemalloc) y filas procesadas. Apagada por defecto; `etapa()`
+# devuelve entonces un objeto vacío compartido y no mide nada.
+#
+# Se activa con configurar() o con variables de entorno:
+#   PACT_TRAZA=traza.json   guarda la traza (JSON, o CSV si termina en .csv)
+#   PACT_PERFIL=carga       además guarda un volcado de cProfile de esa etapa
+
+ACTIVO = False
+_traza = None
+_perfil = None
+_registros = []
+_pila = []
+
+
+class _EtapaNula:
+    filas = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULA = _EtapaNula()
+
+
+class _Etapa:
+    def __init__(self, nombre, filas):
+        self.nombre = nombre
+        self.filas = filas
+        self.pico = 0
+
+    def __enter__(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        actual, pico = tracemalloc.get_traced_memory()
+        if _pila:
+            # reset_peak borra el pico de la etapa exterior; se lo guardamos
+            _pila[-1].pico = max(_pila[-1].pico, pico)
+        tracemalloc.reset_peak()
+        self.memoria_inicial = actual
+        _pila.append(self)
+
+        self.perfilador = None
+        if _perfil == self.nombre:
+            self.perfilador = cProfile.Profile()
+            self.perfilador.enable()
+
+        self.inicio_cpu = time.process_time()
+        self.inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, tipo, valor, traza):
+        segundos = time.perf_counter() - self.inicio
+        segundos_cpu = time.process_time() - self.inicio_cpu
+        if self.perfilador is not None:
+            self.perfilador.disable()
+            self.perfilador.dump_stats(f"perfil_{self.nombre}.prof")
+
+        _pila.pop()
+        pico = max(self.pico, tracemalloc.get_traced_memory()[1])
+        if _pila:
+            _pila[-1].pico = max(_pila[-1].pico, pico)
+        else:
+            tracemalloc.stop()
+
+        _registros.append({
+            "etapa": self.nombre,
+            "segundos": segundos,
+            "segundos_cpu": segundos_cpu,
+            "pico_memoria_bytes": max(pico - self.memoria_inicial, 0),
+            "filas": self.filas,
+            "pid": os.getpid(),
+            "error": tipo.__name__ if tipo is not None else None,
+        })
+        return False
+
+
+def etapa(nombre, filas=None):
+    """Context manager que mide la etapa si la instrumentación está activa.
+
+    Las filas se pueden dar al entrar o asignarse después (`e.filas = n`).
+    """
+    if not ACTIVO:
+        return _NULA
+    return _Etapa(nombre, filas)
+
+
+def configurar(traza=None, perfil=None):
+    """Activa la instrumentación si se da una ruta de traza o una etapa a
+    perfilar; sin argumentos la apaga."""
+    global ACTIVO, _traza, _perfil
+    _traza = traza
+    _perfil = perfil
+    ACTIVO = traza is not None or perfil is not None
+
+
+def desde_entorno():
+    configurar(os.environ.get("PACT_TRAZA") or None, os.environ.get("PACT_PERFIL") or None)
+
+
+def extraer():
+    """Devuelve y vacía los registros (los trabajadores se los pasan al padre)."""
+    registros = list(_registros)
+    _registros.clear()
+    return registros
+
+
+def agregar(registros):
+    _registros.extend(registros)
+
+
+def volcar(ruta=None):
+    """Escribe los registros acumulados en JSON o CSV según la extensión."""
+    ruta = ruta or _traza
+    if ruta is None:
+        return None
+    if ruta.endswith(".csv"):
+        with open(ruta, "w", newline="", encoding="utf-8") as archivo:
+            escritor = csv.DictWriter(archivo, fieldnames=[
+                "etapa", "segundos", "segundos_cpu", "pico_memoria_bytes", "filas", "pid", "error",
+            ])
+            escritor.writeheader()
+            escritor.writerows(_registros)
+    else:
+        with open(ruta, "w", encoding="utf-8") as archivo:
+            json.dump(_registros, archivo, ensure_ascii=False, indent=2)
+    return ruta
+
+
+desde_entorno()
@@ -0,0 +1,154 @@
+import copy
+import weakref
+
+import numpy as np
+import pandas as pd
+
+from .metrics import evaluar
+
+# Consultas de ranking (top-N) para las figuras de tipo tabla de posiciones.
+#
+# Un IndiceRanking guarda el orden de una columna (o métrica) ya calculado;
+# pedir el top-N es entonces tomar los primeros N del orden, sin volver a
+# ordenar el dataset. Los índices se guardan por dataset mientras éste viva
+# (igual que las métricas en metrics.py) y, al agregar filas con
+# agregar_filas, se actualizan intercalando solo las filas nuevas.
+#
+# Sin índice, top_n hace una selección parcial (argpartition): O(n) en vez
+# de ordenar todo. En ambos casos los empates quedan en el orden original de
+# las filas y los NaN al final, como en sort_values(kind="stable").
+
+# Columnas y métricas que ordenan las figuras; indexar() las prepara todas
+COLUMNAS_RANKING = [
+    'Uninsured Rate (2015)',
+    'Annual Tax Credit Expenditure',
+    'Total Insured Approx',
+]
+
+# id(dataset) -> {(columna, ascendente): IndiceRanking}
+_indices = {}
+
+
+def _claves(valores, ascendente):
+    """Claves que se ordenan de menor a mayor; los NaN van al final."""
+    valores = np.asarray(valores, dtype=float)
+    claves = valores if ascendente else -valores
+    return np.where(np.isnan(claves), np.inf, claves)
+
+
+class IndiceRanking:
+    """Orden precomputado de una columna (de mayor a menor por defecto)."""
+
+    def __init__(self, valores, ascendente=False):
+        self.ascendente = ascendente
+        claves = _claves(valores, ascendente)
+        self.orden = np.argsort(claves, kind="stable")
+        self.claves_ordenadas = claves[self.orden]
+
+    def __len__(self):
+        return len(self.orden)
+
+    def top(self, n):
+        """Posiciones de las `n` primeras filas."""
+        return self.orden[:n]
+
+    def rangos(self):
+        """Lugar de cada fila (1 = primera)."""
+        rangos = np.empty(len(self.orden), dtype=np.int64)
+        rangos[self.orden] = np.arange(1, len(self.orden) + 1)
+        return rangos
+
+    def agregar(self, valores):
+        """Intercala filas nuevas (que quedan después de las actuales)."""
+        nuevas = _claves(valores, self.ascendente)
+        orden_nuevas = np.argsort(nuevas, kind="stable")
+        nuevas = nuevas[orden_nuevas]
+        # side="right": ante un empate las filas nuevas quedan después
+        posiciones = np.searchsorted(self.claves_ordenadas, nuevas, side="right")
+        self.orden = np.insert(self.orden, posiciones, len(self.orden) + orden_nuevas)
+        self.claves_ordenadas = np.insert(self.claves_ordenadas, posiciones, nuevas)
+        return self
+
+
+def top_n(valores, n, ascendente=False):
+    """Posiciones de los `n` mayores (o menores) valores, ya ordenadas, con
+    selección parcial en lugar de un ordenamiento completo."""
+    claves = _claves(valores, ascendente)
+    if n >= len(claves):
+        return np.argsort(claves, kind="stable")
+    if n <= 0:
+        return np.empty(0, dtype=np.int64)
+    umbral = np.partition(claves, n - 1)[n - 1]
+    # Todo lo que está antes del umbral, y de los empates con el umbral solo
+    # los primeros en el orden original
+    antes = np.flatnonzero(claves < umbral)
+    empates = np.flatnonzero(claves == umbral)[: n - len(antes)]
+    elegidas = np.concatenate([antes, empates])
+    return elegidas[np.lexsort((elegidas, claves[elegidas]))]
+
+
+def _indices_de(dataset):
+    clave = id(dataset)
+    if clave not in _indices:
+        _indices[clave] = {}
+        weakref.finalize(dataset, _indices.pop, clave, None)
+    return _indices[clave]
+
+
+def indice(dataset, columna, ascendente=False):
+    """Índice de `columna` (columna del dataset o métrica registrada); se
+    construye la primera vez y después se reutiliza."""
+    indices = _indices_de(dataset)
+    actual = indices.get((columna, ascendente))
+    if actual is None or len(actual) != len(dataset):
+        actual = indices[(columna, ascendente)] = IndiceRanking(evaluar(dataset, [columna])[columna], ascendente)
+    return actual
+
+
+def indexar(dataset, columnas=COLUMNAS_RANKING):
+    """Prepara los índices de las columnas que se van a ordenar."""
+    for columna in columnas:
+        indice(dataset, columna)
+    return dataset
+
+
+def ordenar(dataset, columna, ascendente=False):
+    """Equivale a dataset.sort_values(columna, ascending=ascendente, kind="stable")."""
+    return dataset.iloc[indice(dataset, columna, ascendente).orden]
+
+
+def top(dataset, columna, n, ascendente=False):
+    """Las `n` filas con el mayor (o menor) valor de `columna`, en orden.
+
+    Usa el índice si ya existe; si no, una selección parcial.
+    """
+    indices = _indices_de(dataset)
+    existente = indices.get((columna, ascendente))
+    if existente is not None and len(existente) == len(dataset):
+        return dataset.iloc[existente.top(n)]
+    return dataset.iloc[top_n(evaluar(dataset, [columna])[columna], n, ascendente)]
+
+
+def top_por_grupo(dataset, columna, grupo, n, ascendente=False):
+    """Las `n` primeras filas de cada grupo (por ejemplo, los mejores planes
+    de cada estado), agrupadas y en orden dentro de cada grupo."""
+    orden = indice(dataset, columna, ascendente).orden
+    grupos = dataset[grupo].to_numpy()[orden]
+    # Lugar dentro del grupo recorriendo el orden global: sin volver a ordenar
+    lugar = pd.Series(grupos).groupby(grupos, sort=False).cumcount().to_numpy()
+    elegidas = orden[lugar < n]
+    codigos, _ = pd.factorize(dataset[grupo].to_numpy()[elegidas], sort=True)
+    return dataset.iloc[elegidas[np.argsort(codigos, kind="stable")]]
+
+
+def agregar_filas(dataset, nuevas):
+    """Devuelve el dataset con las filas nuevas al final; los índices que ya
+    tenía el dataset pasan al nuevo intercalando solo esas filas."""
+    combinado = pd.concat([dataset, nuevas], ignore_index=True)
+    indices = _indices_de(combinado)
+    for (columna, ascendente), anterior in _indices_de(dataset).items():
+        if len(anterior) != len(dataset):
+            continue
+        valores = evaluar(nuevas, [columna])[columna]
+        indices[(columna, ascendente)] = copy.copy(anterior).agregar(valores)
+    return combinado
@@ -0,0 +1,230 @@
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import matplotlib
+
+# Sin ventanas: se rasteriza directo a PNG con Agg
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt  # noqa: E402
+
+from . import build_cache  # noqa: E402
+from . import export  # noqa: E402
+from . import profiling  # noqa: E402
+from . import ranking  # noqa: E402
+from . import shared  # noqa: E402
+from .visualization import DEPENDENCIAS, FIGURAS, cargar_datos, imprimir_interpretacion  # noqa: E402
+
+# Dataset de cada proceso trabajador; se carga una sola vez por proceso
+_dataset = None
+# Bloque de memoria compartida del que salen las columnas de _dataset
+_memoria = None
+
+
+def _iniciar_trabajador(origen, compartido=None):
+    global _dataset, _memoria
+    matplotlib.use("Agg")
+    profiling.desde_entorno()
+    # Con fork el trabajador hereda los registros que ya tenía el padre; se
+    # descartan para no devolverlos dos veces
+    profiling.extraer()
+    if compartido is None:
+        _dataset = cargar_datos(origen)
+    else:
+        # Las columnas (State_Abbrev incluida) ya vienen preparadas; solo
+        # falta el índice de ranking, que es propio de cada proceso
+        _memoria, dataset = shared.adjuntar(compartido)
+        _dataset = ranking.indexar(dataset)
+
+
+def crear_pool(procesos, origen="states.csv", compartido=None):
+    """Pool de procesos que cargan el dataset una vez al arrancar: desde el
+    artefacto de `origen`, o del descriptor `compartido` de shared.publicar
+    (sin copiar las columnas)."""
+    return ProcessPoolExecutor(procesos, initializer=_iniciar_trabajador, initargs=(origen, compartido))
+
+
+def dibujar(numero, dataset, parametros=None, estados=None):
+    """Dibuja la figura con sus parámetros (ver PARAMETROS en
+    visualization.py), opcionalmente solo con algunos estados."""
+    funcion, _ = FIGURAS[numero]
+    if estados is not None:
+        dataset = dataset[dataset['State'].isin(estados)].reset_index(drop=True)
+    return funcion(dataset, **(parametros or {}))
+
+
+def renderizar_figura(numero, dataset, salida=".", dpi=300, formatos=export.FORMATOS_DEFECTO, entrada=None,
+                      forzar=False):
+    """Dibuja una figura una vez y la exporta en cada formato (ver export.py).
+
+    Con `entrada` (la de build_cache) los bytes se buscan primero en la
+    caché de exportación y la figura solo se dibuja si falta algún formato.
+    Con `forzar` se dibuja siempre y se reescriben las entradas de la caché.
+    Devuelve (número, rutas, segundos).
+    """
+    inicio = time.perf_counter()
+    funcion, nombre = FIGURAS[numero]
+    if entrada is None:
+        entrada = build_cache.entrada_cache(funcion, DEPENDENCIAS[numero],
+                                            build_cache.hashes_columnas(dataset, DEPENDENCIAS[numero]), {"dpi": dpi})
+    claves = export.claves(entrada, formatos, dpi)
+    pendientes = list(formatos) if forzar else export.faltantes(salida, claves)
+    if pendientes:
+        with profiling.etapa(f"figura_{numero}.dibujo", len(dataset)):
+            fig = funcion(dataset)
+        with profiling.etapa(f"figura_{numero}.guardado"):
+            export.guardar_en_cache(salida, claves, export.codificar(fig, pendientes, dpi))
+        plt.close(fig)
+    rutas = export.materializar(salida, nombre, claves)
+    return numero, rutas, time.perf_counter() - inicio
+
+
+def _renderizar_en_trabajador(numero, salida, dpi, formatos, entrada, forzar):
+    # Los registros de instrumentación viajan de regreso con el resultado
+    return renderizar_figura(numero, _dataset, salida, dpi, formatos, entrada, forzar), profiling.extraer()
+
+
+def codificar_variante(numero, parametros, estados, formato, dpi):
+    """Bytes de una variante de la figura en un formato. Corre dentro de un
+    trabajador de crear_pool (lo usa server.py)."""
+    fig = dibujar(numero, _dataset, parametros, estados)
+    datos = export.codificar(fig, [formato], dpi)[formato]
+    plt.close(fig)
+    return datos
+
+
+def renderizar(figuras=None, origen="states.csv", salida=".", procesos=None, dpi=300, incremental=True,
+               formatos=export.FORMATOS_DEFECTO):
+    """Renderiza las figuras pedidas a partir del artefacto de `origen` (ver
+    renderizar_dataset)."""
+    return renderizar_dataset(cargar_datos(origen), figuras, salida, procesos, dpi, incremental, formatos)
+
+
+def renderizar_dataset(dataset, figuras=None, salida=".", procesos=None, dpi=300, incremental=True,
+                       formatos=export.FORMATOS_DEFECTO):
+    """Renderiza las figuras pedidas en paralelo, una por proceso.
+
+    `dataset` es el dataset ya preparado (visualization.preparar); los
+    trabajadores lo reciben por memoria compartida (ver shared.py).
+    Con `incremental` se saltan las figuras cuyas columnas (DEPENDENCIAS),
+    código y parámetros no cambiaron desde la última corrida en `salida`;
+    sin `incremental` todas se vuelven a dibujar, sin usar la caché de
+    exportación. Con `procesos=1` se dibujan en secuencia dentro del mismo proceso.
+    Cada figura se escribe en los `formatos` pedidos (ver export.py).
+    Devuelve una lista de (número, rutas, segundos) en el orden de `figuras`;
+    las figuras omitidas llevan `None` en lugar de segundos.
+    """
+    if figuras is None:
+        figuras = sorted(FIGURAS)
+    os.makedirs(salida, exist_ok=True)
+
+    cache = build_cache.leer_cache(salida)
+    hashes = build_cache.hashes_columnas(dataset, [c for n in figuras for c in DEPENDENCIAS[n]])
+    entradas = {
+        numero: build_cache.entrada_cache(FIGURAS[numero][0], DEPENDENCIAS[numero], hashes, {"dpi": dpi})
+        for numero in figuras
+    }
+
+    resultados = {}
+    pendientes = []
+    for numero in figuras:
+        nombre = FIGURAS[numero][1]
+        archivos = [export.nombre_salida(nombre, formato) for formato in formatos]
+        # La caché guarda la entrada sin los formatos: así un formato nuevo
+        # reutiliza los bytes que ya están en la caché de exportación
+        if incremental and build_cache.esta_al_dia(cache, nombre, entradas[numero], salida, archivos):
+            resultados[numero] = (numero, [os.path.join(salida, archivo) for archivo in archivos], None)
+        else:
+            pendientes.append(numero)
+
+    procesos = min(procesos or os.cpu_count() or 1, max(len(pendientes), 1))
+    if procesos <= 1:
+        for numero in pendientes:
+            resultados[numero] = renderizar_figura(numero, dataset, salida, dpi, formatos, entradas[numero],
+                                                   not incremental)
+    else:
+        with profiling.etapa("memoria_compartida", len(dataset)):
+            publicacion = shared.publicar(dataset)
+        # El pool termina (y suelta el bloque) antes de liberar la publicación
+        with publicacion, crear_pool(procesos, compartido=publicacion.descriptor) as pool:
+            futuros = [pool.submit(_renderizar_en_trabajador, numero, salida, dpi, formatos, entradas[numero],
+                                   not incremental)
+                       for numero in pendientes]
+            for futuro in as_completed(futuros):
+                resultado, registros = futuro.result()
+                resultados[resultado[0]] = resultado
+                profiling.agregar(registros)
+
+    if pendientes:
+        for numero in pendientes:
+            cache[FIGURAS[numero][1]] = entradas[numero]
+        build_cache.escribir_cache(salida, cache)
+        export.podar_cache(salida)
+    return [resultados[numero] for numero in figuras]
+
+
+def parsear_figuras(texto):
+    """'1,5,9' -> [1, 5, 9]; 'all' o vacío -> todas."""
+    if not texto or texto == "all":
+        return sorted(FIGURAS)
+    figuras = [int(parte) for parte in texto.split(",") if parte.strip()]
+    desconocidas = [numero for numero in figuras if numero not in FIGURAS]
+    if desconocidas:
+        raise ValueError(f"Figuras desconocidas: {desconocidas}. Disponibles: {sorted(FIGURAS)}")
+    return figuras
+
+
+def parsear_formatos(texto):
+    """'png,svg' -> ['png', 'svg'], validando cada nombre antes de dibujar."""
+    formatos = [formato.strip() for formato in texto.split(",") if formato.strip()]
+    for formato in formatos:
+        export.especificacion(formato)
+    return formatos
+
+
+def reportar(resultados, interpretacion=True):
+    """Imprime las rutas y tiempos de cada figura (y su interpretación)."""
+    for numero, rutas, segundos in resultados:
+        if segundos is None:
+            print(f"Figura {numero}: {', '.join(rutas)} (sin cambios, omitida)")
+            continue
+        if interpretacion:
+            imprimir_interpretacion(numero)
+        print(f"Figura {numero}: {', '.join(rutas)} ({segundos:.2f} s)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Renderiza las figuras sin ventanas y en paralelo.")
+    parser.add_argument("--figures", default="all", help="ej. 1,5,9 (por defecto todas)")
+    parser.add_argument("--origen", default="states.csv")
+    parser.add_argument("--salida", default=".")
+    parser.add_argument("--procesos", type=int, default=None)
+    parser.add_argument("--dpi", type=int, default=300, help="dpi del PNG principal")
+    parser.add_argument("--formatos", default=",".join(export.FORMATOS_DEFECTO),
+                        help=f"formatos a exportar, separados por coma: {', '.join(export.FORMATOS)}")
+    parser.add_argument("--forzar", action="store_true", help="redibuja aunque nada haya cambiado")
+    parser.add_argument("--sin-interpretacion", action="store_true")
+    parser.add_argument("--traza", help="guarda tiempos y memoria por etapa (.json o .csv)")
+    parser.add_argument("--perfil", help="etapa de la que se guarda un volcado de cProfile, ej. figura_3.guardado")
+    args = parser.parse_args(argv)
+
+    if args.traza or args.perfil:
+        # Por variables de entorno para que también lo vean los trabajadores
+        os.environ["PACT_TRAZA"] = args.traza or ""
+        os.environ["PACT_PERFIL"] = args.perfil or ""
+        profiling.configurar(args.traza, args.perfil)
+
+    inicio = time.perf_counter()
+    resultados = renderizar(parsear_figuras(args.figures), args.origen, args.salida, args.procesos, args.dpi,
+                             incremental=not args.forzar, formatos=parsear_formatos(args.formatos))
+    total = time.perf_counter() - inicio
+    reportar(resultados, not args.sin_interpretacion)
+    print(f"Total: {total:.2f} s")
+    if profiling.volcar():
+        print(f"Traza en {args.traza}")
+
+
+if __name__ == "__main__":
+    main()
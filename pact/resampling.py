@@ -0,0 +1,149 @@
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from . import panel
+from .artifact import cargar_procesado
+
+# Bootstrap y pruebas de permutación para la diferencia de medias entre dos
+# grupos de estados (por ejemplo, los que expandieron Medicaid y los que no).
+#
+# Todas las réplicas se sortean de una vez como una matriz de índices
+# (réplicas x estados) y se convierten en una matriz de conteos: cuántas
+# veces entra cada estado en cada réplica. Las medias de todas las réplicas
+# y de todas las columnas salen entonces de un solo producto de matrices
+# (conteos @ valores), sin recorrer réplicas ni columnas en Python. Los NaN
+# se excluyen columna por columna con la misma cuenta sobre la máscara.
+
+REPLICAS_DEFECTO = 10_000
+NIVEL_DEFECTO = 0.95
+
+
+def indices_bootstrap(rng, n_a, n_b, replicas):
+    """Matriz (réplicas x n_a + n_b): las primeras n_a columnas remuestrean
+    el grupo a (posiciones 0..n_a-1) y las demás el grupo b."""
+    return np.concatenate([
+        rng.integers(0, n_a, (replicas, n_a)),
+        n_a + rng.integers(0, n_b, (replicas, n_b)),
+    ], axis=1)
+
+
+def indices_permutacion(rng, n, replicas):
+    """Matriz (réplicas x n) con una permutación de 0..n-1 por fila."""
+    return np.argsort(rng.random((replicas, n)), axis=1)
+
+
+def conteos(indices, n):
+    """Veces que aparece cada posición en cada fila de `indices`, (réplicas x n)."""
+    replicas = len(indices)
+    desplazados = indices + (np.arange(replicas) * n)[:, None]
+    return np.bincount(desplazados.ravel(), minlength=replicas * n).reshape(replicas, n).astype(float)
+
+
+def _medias(pesos, valores, presentes):
+    """Medias ponderadas por fila de `pesos` de cada columna, ignorando NaN."""
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return (pesos @ valores) / (pesos @ presentes)
+
+
+def comparar_grupos(dataset, grupo, columnas, replicas=REPLICAS_DEFECTO, semilla=0, nivel=NIVEL_DEFECTO):
+    """Diferencia de medias (grupo True menos grupo False) de cada columna,
+    con intervalo bootstrap percentil y p-valor de permutación (dos colas).
+
+    `grupo` es el nombre de una columna booleana o un arreglo booleano; las
+    filas sin grupo se descartan.
+    """
+    marcas = pd.Series(dataset[grupo] if isinstance(grupo, str) else grupo, index=dataset.index)
+    validas = marcas.notna().to_numpy()
+    en_grupo = marcas[validas].astype(bool).to_numpy()
+    # Grupo a primero: así la matriz de bootstrap queda en dos bloques
+    orden = np.argsort(~en_grupo, kind="stable")
+    valores = dataset.loc[validas, list(columnas)].to_numpy(dtype=float)[orden]
+    n_a, n = int(en_grupo.sum()), len(orden)
+    n_b = n - n_a
+    if n_a == 0 or n_b == 0:
+        raise ValueError("Los dos grupos necesitan al menos un estado")
+
+    presentes = ~np.isnan(valores)
+    valores = np.where(presentes, valores, 0.0)
+    presentes = presentes.astype(float)
+    a, b = np.zeros(n), np.zeros(n)
+    a[:n_a], b[n_a:] = 1.0, 1.0
+    observada = _medias(a, valores, presentes) - _medias(b, valores, presentes)
+
+    flujo_bootstrap, flujo_permutacion = np.random.SeedSequence(semilla).spawn(2)
+    pesos = conteos(indices_bootstrap(np.random.default_rng(flujo_bootstrap), n_a, n_b, replicas), n)
+    diferencias = _medias(pesos * a, valores, presentes) - _medias(pesos * b, valores, presentes)
+    alfa = (1 - nivel) / 2
+    inferior, superior = np.nanquantile(diferencias, [alfa, 1 - alfa], axis=0)
+
+    # En cada permutación, las primeras n_a posiciones hacen de grupo a
+    permutaciones = indices_permutacion(np.random.default_rng(flujo_permutacion), n, replicas)
+    pertenece_a = np.zeros((replicas, n))
+    np.put_along_axis(pertenece_a, permutaciones[:, :n_a], 1.0, axis=1)
+    nulas = _medias(pertenece_a, valores, presentes) - _medias(1 - pertenece_a, valores, presentes)
+    # La tolerancia relativa cuenta como empate lo que solo difiere por redondeo
+    extremas = (np.abs(nulas) >= np.abs(observada) * (1 - 1e-9)).sum(axis=0)
+    p_valor = (extremas + 1) / (replicas + 1)
+
+    return pd.DataFrame({
+        "diferencia": observada,
+        "ic_inferior": inferior,
+        "ic_superior": superior,
+        "p_valor": p_valor,
+        "n_grupo": (presentes[:n_a]).sum(axis=0).astype(int),
+        "n_resto": (presentes[n_a:]).sum(axis=0).astype(int),
+    }, index=pd.Index(list(columnas), name="columna"))
+
+
+def comparar_panel(tabla_panel, grupos, medidas=None, **opciones):
+    """comparar_grupos para cada (medida, año) del panel (State, Year).
+
+    `grupos` es una serie booleana indexada por estado, por ejemplo
+    dataset.set_index('State')['State Medicaid Expansion (2016)'].
+    """
+    if medidas is None:
+        medidas = [medida for medida in tabla_panel.columns if not pd.api.types.is_bool_dtype(tabla_panel[medida])]
+    ancho = tabla_panel[list(medidas)].astype(float).unstack("Year")
+    ancho.columns = [f"{medida} ({anio})" for medida, anio in ancho.columns]
+    ancho = ancho.dropna(axis=1, how="all")
+    marcas = pd.Series(grupos).reindex(ancho.index.astype(str))
+    return comparar_grupos(ancho, marcas.to_numpy(), ancho.columns, **opciones)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Bootstrap y permutaciones de la diferencia entre estados con y sin expansión de Medicaid.")
+    parser.add_argument("--origen", default="states.csv")
+    parser.add_argument("--replicas", type=int, default=REPLICAS_DEFECTO)
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--nivel", type=float, default=NIVEL_DEFECTO)
+    parser.add_argument("--salida", help="guarda la tabla en CSV")
+    args = parser.parse_args(argv)
+
+    dataset = cargar_procesado(args.origen)
+    grupo = 'State Medicaid Expansion (2016)'
+    columnas = [columna for columna in dataset.columns
+                if columna != grupo and pd.api.types.is_numeric_dtype(dataset[columna])
+                and not pd.api.types.is_bool_dtype(dataset[columna])]
+
+    inicio = time.perf_counter()
+    tabla = comparar_grupos(dataset, grupo, columnas, args.replicas, args.semilla, args.nivel)
+    por_anio = comparar_panel(panel.panel_desde_ancho(dataset),
+                              dataset.set_index(dataset['State'].astype(str))[grupo],
+                              replicas=args.replicas, semilla=args.semilla, nivel=args.nivel)
+    segundos = time.perf_counter() - inicio
+
+    tabla = pd.concat([tabla, por_anio[~por_anio.index.isin(tabla.index)]])
+    print(f"{args.replicas:,} réplicas x {len(tabla)} columnas en {segundos:.2f} s")
+    with pd.option_context("display.width", 160, "display.max_rows", None, "display.max_columns", None, "display.float_format", "{:,.4g}".format):
+        print(tabla)
+    if args.salida:
+        tabla.to_csv(args.salida)
+        print(f"Tabla en {args.salida}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+import argparse
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from .artifact import cargar_procesado
+from .metrics import con_metricas
+
+# Motor de escenarios de recorte de subsidios ("espiral de la muerte" que
+# mencionan las interpretaciones de las figuras 2 y 5).
+#
+# Cada escenario sortea un recorte del crédito fiscal mensual, una elasticidad
+# de la inscripción al precio y una intensidad de antiselección. Por estado:
+#   - los inscritos con subsidio ('Marketplace Tax Credits (2016)') pierden
+#     `recorte` de su crédito y se dan de baja en 1 - exp(-elasticidad * recorte);
+#   - los que se van dejan un pool más caro: la prima sube `antiseleccion`
+#     veces la fracción perdida, y los inscritos sin subsidio (el resto de
+#     'Marketplace Health Insurance Coverage (2016)') responden a esa subida,
+#     lo que vuelve a encarecer el pool. Se itera hasta `RONDAS` veces.
+# La elasticidad lleva además un ruido lognormal por estado y escenario, así
+# que cada celda del arreglo estados x escenarios es un sorteo distinto.
+#
+# Todo se calcula con arreglos (estados x escenarios) por bloques de
+# escenarios; cada bloque usa su propio flujo de SeedSequence, así que el
+# resultado es el mismo con uno o varios procesos.
+
+# Rangos uniformes de los parámetros de cada escenario
+RANGOS = {
+    "recorte": (0.0, 0.5),
+    "elasticidad": (0.1, 1.0),
+    "antiseleccion": (0.0, 0.6),
+}
+# Dispersión (desviación del logaritmo) de la elasticidad entre estados
+DISPERSION_ESTADOS = 0.25
+RONDAS = 10
+ESCENARIOS_POR_BLOQUE = 10_000
+
+# Pérdida de inscritos a partir de la cual el escenario cuenta como espiral
+UMBRAL_ESPIRAL = 0.3
+
+
+def _simular_bloque(flujo, n, subsidiados, no_subsidiados, rangos):
+    """Pérdida de inscritos y cambio relativo del gasto, (estados x n)."""
+    rng = np.random.default_rng(flujo)
+    recorte = rng.uniform(*rangos["recorte"], n)
+    elasticidad_base = rng.uniform(*rangos["elasticidad"], n)
+    antiseleccion = rng.uniform(*rangos["antiseleccion"], n)
+    ruido = rng.standard_normal((len(subsidiados), n))
+    elasticidad = elasticidad_base * np.exp(DISPERSION_ESTADOS * ruido - DISPERSION_ESTADOS ** 2 / 2)
+
+    s = subsidiados[:, None]
+    u = no_subsidiados[:, None]
+    total = s + u
+    baja_subsidiados = -np.expm1(-elasticidad * recorte)
+    baja_resto = np.zeros_like(baja_subsidiados)
+    for _ in range(RONDAS):
+        perdida_pool = (s * baja_subsidiados + u * baja_resto) / total
+        baja_resto = -np.expm1(-elasticidad * antiseleccion * perdida_pool)
+
+    perdida = (s * baja_subsidiados + u * baja_resto) / total
+    # Gasto nuevo / gasto base: menos inscritos con subsidio y crédito recortado
+    cambio_gasto = (1 - baja_subsidiados) * (1 - recorte) - 1
+    return perdida.astype(np.float32), cambio_gasto.astype(np.float32), (recorte, elasticidad_base, antiseleccion)
+
+
+def simular(dataset, escenarios=100_000, semilla=0, procesos=1, rangos=None):
+    """Simula `escenarios` recortes por estado.
+
+    El gasto base es 'Annual Tax Credit Expenditure' (créditos x crédito
+    mensual promedio x 12); cada escenario lo escala por los inscritos con
+    subsidio que quedan y por el crédito recortado.
+
+    Devuelve un dict con los estados, el gasto base, las distribuciones
+    'perdida_inscritos' y 'cambio_gasto' (arreglos estados x escenarios,
+    fracciones) y los parámetros sorteados.
+    """
+    rangos = {**RANGOS, **(rangos or {})}
+    con_metricas(dataset, ['Annual Tax Credit Expenditure'])
+    marketplace = dataset['Marketplace Health Insurance Coverage (2016)'].to_numpy(dtype=float)
+    subsidiados = np.minimum(dataset['Marketplace Tax Credits (2016)'].to_numpy(dtype=float), marketplace)
+
+    n_bloques = max(1, -(-escenarios // ESCENARIOS_POR_BLOQUE))
+    flujos = np.random.SeedSequence(semilla).spawn(n_bloques)
+    tamanos = [min(ESCENARIOS_POR_BLOQUE, escenarios - i * ESCENARIOS_POR_BLOQUE) for i in range(n_bloques)]
+    argumentos = (flujos, tamanos, [subsidiados] * n_bloques, [marketplace - subsidiados] * n_bloques,
+                  [rangos] * n_bloques)
+
+    if procesos and procesos > 1:
+        with ProcessPoolExecutor(min(procesos, n_bloques)) as pool:
+            bloques = list(pool.map(_simular_bloque, *argumentos))
+    else:
+        bloques = list(map(_simular_bloque, *argumentos))
+
+    return {
+        "estados": dataset['State'].astype(str).to_numpy(),
+        "gasto_base": dataset['Annual Tax Credit Expenditure'].to_numpy(dtype=float),
+        "dependencia": subsidiados / marketplace,
+        "perdida_inscritos": np.concatenate([bloque[0] for bloque in bloques], axis=1),
+        "cambio_gasto": np.concatenate([bloque[1] for bloque in bloques], axis=1),
+        "parametros": {
+            nombre: np.concatenate([bloque[2][i] for bloque in bloques])
+            for i, nombre in enumerate(["recorte", "elasticidad", "antiseleccion"])
+        },
+    }
+
+
+def resumir(resultado, umbral=UMBRAL_ESPIRAL):
+    """Tabla por estado: cuantiles de la pérdida de inscritos, probabilidad
+    de espiral (pérdida > `umbral`) y ahorro federal en dólares."""
+    perdida = resultado["perdida_inscritos"]
+    p5, p50, p95 = np.quantile(perdida, [0.05, 0.5, 0.95], axis=1)
+    # El ahorro es el cambio del gasto con el signo invertido
+    cambio_p5, cambio_p50 = np.quantile(resultado["cambio_gasto"], [0.05, 0.5], axis=1)
+    tabla = pd.DataFrame({
+        "dependencia": resultado["dependencia"],
+        "perdida_media": perdida.mean(axis=1),
+        "perdida_p5": p5,
+        "perdida_p50": p50,
+        "perdida_p95": p95,
+        "prob_espiral": (perdida > umbral).mean(axis=1),
+        "ahorro_gasto_p50": -cambio_p50 * resultado["gasto_base"],
+        "ahorro_gasto_p95": -cambio_p5 * resultado["gasto_base"],
+    }, index=pd.Index(resultado["estados"], name="State"))
+    return tabla.sort_values("perdida_p50", ascending=False)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Escenarios Monte Carlo de recorte de subsidios por estado.")
+    parser.add_argument("--origen", default="states.csv")
+    parser.add_argument("--escenarios", type=int, default=100_000)
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--procesos", type=int, default=1)
+    parser.add_argument("--umbral", type=float, default=UMBRAL_ESPIRAL, help="pérdida que cuenta como espiral")
+    parser.add_argument("--salida", help="guarda el resumen por estado en CSV")
+    args = parser.parse_args(argv)
+
+    dataset = cargar_procesado(args.origen)
+    inicio = time.perf_counter()
+    resultado = simular(dataset, args.escenarios, args.semilla, args.procesos)
+    segundos = time.perf_counter() - inicio
+    tabla = resumir(resultado, args.umbral)
+
+    print(f"{args.escenarios:,} escenarios x {len(tabla)} estados en {segundos:.2f} s")
+    with pd.option_context("display.width", 160, "display.max_columns", None, "display.float_format", "{:,.3f}".format):
+        print(tabla.head(15))
+    if args.salida:
+        tabla.to_csv(args.salida)
+        print(f"Resumen en {args.salida}")
+
+
+if __name__ == "__main__":
+    main()
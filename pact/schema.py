@@ -0,0 +1,146 @@
+import io
+import time
+
+import numpy as np
+import pandas as pd
+
+# Esquema declarado del archivo de estados: columna -> tipo de dato.
+# Cada tipo se resuelve al leer el archivo, de modo que el DataFrame sale
+# ya numérico y no hay que limpiar columna por columna después.
+ESQUEMA = {
+    "State": "texto",
+    "Uninsured Rate (2010)": "porcentaje",
+    "Uninsured Rate (2015)": "porcentaje",
+    "Uninsured Rate Change (2010-2015)": "porcentaje",
+    "Health Insurance Coverage Change (2010-2015)": "entero",
+    "Employer Health Insurance Coverage (2015)": "entero",
+    "Marketplace Health Insurance Coverage (2016)": "entero",
+    "Marketplace Tax Credits (2016)": "entero",
+    "Average Monthly Tax Credit (2016)": "moneda",
+    "State Medicaid Expansion (2016)": "booleano",
+    "Medicaid Enrollment (2013)": "entero_nulo",
+    "Medicaid Enrollment (2016)": "entero",
+    "Medicaid Enrollment Change (2013-2016)": "entero_nulo",
+    "Medicare Enrollment (2016)": "entero",
+}
+
+
+# Símbolos que se quitan del archivo antes de que lo lea pandas: así los
+# porcentajes y los montos en dólares quedan como números que el lector en C
+# convierte solo, sin un convertidor de Python por celda. El único texto del
+# esquema es el nombre del estado, que no los lleva.
+SIMBOLOS = b"%$"
+
+# Decimales que se conservan exactos al pasar de porcentaje a fracción
+DECIMALES_PORCENTAJE = 9
+
+
+class _SinSimbolos(io.RawIOBase):
+    """Archivo binario que entrega el contenido de otro sin SIMBOLOS."""
+
+    def __init__(self, archivo):
+        self.archivo = archivo
+
+    def readable(self):
+        return True
+
+    def readinto(self, destino):
+        while True:
+            bloque = self.archivo.read(len(destino))
+            if not bloque:
+                return 0
+            bloque = bloque.translate(None, SIMBOLOS)
+            # Un bloque hecho solo de símbolos no es el fin del archivo
+            if bloque:
+                destino[:len(bloque)] = bloque
+                return len(bloque)
+
+    def close(self):
+        self.archivo.close()
+        super().close()
+
+
+def porcentaje_a_fraccion(valores):
+    """23.8 -> 0.238, con el float correctamente redondeado (0.101 y no
+    0.10099999999999999, que es lo que da dividir entre 100).
+
+    Se pasa por el entero m = valor x 10**DECIMALES_PORCENTAJE, que es exacto
+    para porcentajes con hasta ese número de decimales, y se divide entre
+    10**(DECIMALES_PORCENTAJE + 2): una sola división entre dos números
+    exactos, que IEEE 754 redondea correctamente.
+    """
+    valores = np.asarray(valores, dtype=float)
+    return np.round(valores * 10.0 ** DECIMALES_PORCENTAJE) / 10.0 ** (DECIMALES_PORCENTAJE + 2)
+
+
+# Tipos que el lector de pandas resuelve por sí solo (motor en C). Los
+# porcentajes se leen como número y después se pasan a fracción; la moneda
+# queda entera, o flotante si hay celdas vacías
+TIPOS_NATIVOS = {
+    "texto": "str",
+    "entero": "int64",
+    "entero_nulo": "float64",
+    "booleano": "boolean",
+    "porcentaje": "float64",
+}
+TIPOS_INFERIDOS = {"moneda"}
+
+
+def argumentos_lectura(esquema=ESQUEMA, columnas=None):
+    """Traduce el esquema a los argumentos de read_csv (sobre el archivo sin
+    SIMBOLOS, ver leer_csv)."""
+    if columnas is None:
+        columnas = list(esquema)
+
+    dtype = {}
+    for columna in columnas:
+        tipo = esquema[columna]
+        if tipo in TIPOS_NATIVOS:
+            dtype[columna] = TIPOS_NATIVOS[tipo]
+        elif tipo not in TIPOS_INFERIDOS:
+            raise ValueError(f"Tipo desconocido en el esquema: {columna!r} -> {tipo!r}")
+
+    return {
+        "usecols": columnas,
+        "dtype": dtype,
+        "thousands": ",",
+        "true_values": ["True", "true", "TRUE"],
+        "false_values": ["False", "false", "FALSE"],
+    }
+
+
+def _convertir(dataset, esquema):
+    for columna in dataset.columns:
+        if esquema.get(columna) == "porcentaje":
+            dataset[columna] = porcentaje_a_fraccion(dataset[columna])
+    return dataset
+
+
+def _lotes(lector, esquema):
+    with lector:
+        for lote in lector:
+            yield _convertir(lote, esquema)
+
+
+def leer_csv(ruta, esquema=ESQUEMA, columnas=None, chunksize=None, verbose=False):
+    """Lee el CSV aplicando el esquema en la misma pasada de lectura.
+
+    Con `chunksize` devuelve un iterador de lotes (ver pipeline.py).
+    Con `verbose` reporta la velocidad de lectura en filas por segundo.
+    """
+    argumentos = argumentos_lectura(esquema, columnas)
+    archivo = io.BufferedReader(_SinSimbolos(open(ruta, "rb")), buffer_size=1 << 20)
+
+    if chunksize is not None:
+        return _lotes(pd.read_csv(archivo, chunksize=chunksize, **argumentos), esquema)
+
+    inicio = time.perf_counter()
+    with archivo:
+        dataset = _convertir(pd.read_csv(archivo, **argumentos), esquema)
+    segundos = time.perf_counter() - inicio
+
+    if verbose:
+        filas_por_segundo = len(dataset) / segundos if segundos > 0 else float("inf")
+        print(f"Leídas {len(dataset):,} filas en {segundos:.3f} s ({filas_por_segundo:,.0f} filas/s)")
+
+    return dataset
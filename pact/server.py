@@ -0,0 +1,330 @@
+import argparse
+import asyncio
+import json
+import os
+import time
+from collections import OrderedDict, deque
+from concurrent.futures.process import BrokenProcessPool
+from urllib.parse import parse_qs, urlsplit
+
+from . import export
+from . import render
+from .artifact import DIRECTORIO_ARTEFACTO, cargar_procesado, leer_meta
+from .visualization import FIGURAS, PARAMETROS
+
+# Servidor HTTP local (asyncio) que dibuja las figuras bajo pedido:
+#
+#     GET /figura/5?top=20                  Top 20 en lugar de Top 15
+#     GET /figura/8?bins=20&formato=svg
+#     GET /figura/1?estados=Texas,Ohio&dpi=150
+#     GET /metricas                         aciertos de caché y latencias
+#     GET /                                 figuras y parámetros disponibles
+#
+# Cada figura se dibuja en un pool de procesos (render.crear_pool) para no
+# bloquear el ciclo de eventos. El resultado se guarda en una caché LRU
+# acotada en bytes; pedidos repetidos se responden desde memoria, y pedidos
+# iguales que llegan mientras se dibuja esperan al mismo dibujo. Los
+# trabajadores cargan el dataset al arrancar: si states.csv cambia, hay que
+# reiniciar el servidor. Si un trabajador muere (por ejemplo, sin memoria),
+# el pool queda roto y se reemplaza por uno nuevo.
+MAX_BYTES_CACHE = 64 * 1024 ** 2
+DPI_DEFECTO = 100
+MAX_DPI = 300
+# Cada barra del histograma es un objeto de matplotlib: sin tope, un pedido
+# con bins enorme deja a un trabajador sin memoria
+MAX_BINS = 200
+
+# Latencias que se conservan para las métricas (las más recientes)
+VENTANA_LATENCIAS = 1000
+
+TIPOS_CONTENIDO = {"png": "image/png", "svg": "image/svg+xml", "webp": "image/webp"}
+RAZONES = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 500: "Internal Server Error"}
+
+
+class CacheLRU:
+    """Caché clave -> bytes que descarta lo usado hace más tiempo al pasar de
+    `max_bytes`."""
+
+    def __init__(self, max_bytes=MAX_BYTES_CACHE):
+        self.max_bytes = max_bytes
+        self.entradas = OrderedDict()
+        self.bytes = 0
+        self.aciertos = 0
+        self.fallos = 0
+
+    def obtener(self, clave):
+        datos = self.entradas.get(clave)
+        if datos is None:
+            self.fallos += 1
+            return None
+        self.entradas.move_to_end(clave)
+        self.aciertos += 1
+        return datos
+
+    def guardar(self, clave, datos):
+        if len(datos) > self.max_bytes:
+            return
+        anterior = self.entradas.pop(clave, None)
+        if anterior is not None:
+            self.bytes -= len(anterior)
+        self.entradas[clave] = datos
+        self.bytes += len(datos)
+        while self.bytes > self.max_bytes:
+            _, descartado = self.entradas.popitem(last=False)
+            self.bytes -= len(descartado)
+
+    @property
+    def tasa_aciertos(self):
+        total = self.aciertos + self.fallos
+        return self.aciertos / total if total else None
+
+
+def _resumen_latencias(valores):
+    if not valores:
+        return {"n": 0}
+    ordenados = sorted(valores)
+
+    def percentil(p):
+        return ordenados[min(len(ordenados) - 1, int(p * len(ordenados)))] * 1000
+
+    return {"n": len(ordenados), "p50": percentil(0.5), "p95": percentil(0.95), "max": ordenados[-1] * 1000}
+
+
+class Servidor:
+    def __init__(self, origen="states.csv", procesos=None, max_bytes=MAX_BYTES_CACHE):
+        self.origen = origen
+        self.procesos = procesos or os.cpu_count() or 1
+        self.cache = CacheLRU(max_bytes)
+        self.en_curso = {}
+        self.latencias = {"acierto": deque(maxlen=VENTANA_LATENCIAS), "fallo": deque(maxlen=VENTANA_LATENCIAS)}
+        self.solicitudes = 0
+        self.errores = 0
+        self.inicio = time.time()
+        self.pool = None
+        self.reinicios_pool = 0
+
+    async def iniciar(self, host="127.0.0.1", puerto=8000):
+        # El artefacto se valida (y si hace falta se regenera) una vez aquí;
+        # los trabajadores solo lo abren con memory-map
+        cargar_procesado(self.origen, DIRECTORIO_ARTEFACTO)
+        meta = leer_meta(DIRECTORIO_ARTEFACTO)
+        self.hash_datos = meta["hash_origen"]
+        self.estados = next(set(info["categorias"]) for info in meta["columnas"] if info["nombre"] == "State")
+        self.pool = render.crear_pool(self.procesos, self.origen)
+        return await asyncio.start_server(self._atender, host, puerto)
+
+    def cerrar(self):
+        if self.pool is not None:
+            self.pool.shutdown(cancel_futures=True)
+
+    def parsear(self, numero, consulta):
+        """(número, parámetros, estados, formato, dpi) a partir de la URL.
+        LookupError si la figura no existe, ValueError si algo no es válido."""
+        if not numero.isdigit() or int(numero) not in FIGURAS:
+            raise LookupError(f"Figura desconocida: {numero}. Disponibles: {sorted(FIGURAS)}")
+        numero = int(numero)
+        valores = {nombre: lista[-1] for nombre, lista in consulta.items()}
+
+        formato = valores.pop("formato", "png")
+        export.especificacion(formato)
+        dpi = int(valores.pop("dpi", DPI_DEFECTO))
+        if not 1 <= dpi <= MAX_DPI:
+            raise ValueError(f"dpi debe estar entre 1 y {MAX_DPI}")
+
+        estados = None
+        if "estados" in valores:
+            estados = tuple(sorted({estado.strip() for estado in valores.pop("estados").split(",") if estado.strip()}))
+            desconocidos = [estado for estado in estados if estado not in self.estados]
+            if desconocidos or not estados:
+                raise ValueError(f"Estados desconocidos: {desconocidos}")
+
+        parametros = {}
+        for nombre, tipo in PARAMETROS.get(numero, {}).items():
+            if nombre in valores:
+                parametros[nombre] = tipo(valores.pop(nombre))
+                if parametros[nombre] <= 0:
+                    raise ValueError(f"{nombre} debe ser positivo")
+        # Un top mayor que la cantidad de estados dibuja lo mismo que todos
+        if "top" in parametros:
+            parametros["top"] = min(parametros["top"], len(self.estados))
+        if parametros.get("bins", 0) > MAX_BINS:
+            raise ValueError(f"bins debe estar entre 1 y {MAX_BINS}")
+        if valores:
+            raise ValueError(f"Parámetros no reconocidos para la figura {numero}: {sorted(valores)}")
+        return numero, parametros, estados, formato, dpi
+
+    async def figura(self, numero, parametros, estados, formato, dpi):
+        """Bytes de la figura y si salieron de la caché."""
+        # El dpi efectivo del formato (ninguno en SVG, fijo en la miniatura),
+        # para no guardar copias iguales con otra clave
+        dpi_efectivo = export.especificacion(formato, dpi).get("dpi")
+        clave = (self.hash_datos, numero, tuple(sorted(parametros.items())), estados, formato, dpi_efectivo)
+        datos = self.cache.obtener(clave)
+        if datos is not None:
+            return datos, True
+
+        # Pedidos iguales simultáneos esperan al mismo dibujo
+        futuro = self.en_curso.get(clave)
+        if futuro is None:
+            pool = self.pool
+            argumentos = (render.codificar_variante, numero, parametros, list(estados) if estados else None,
+                          formato, dpi)
+            try:
+                futuro = asyncio.get_running_loop().run_in_executor(pool, *argumentos)
+            except BrokenProcessPool:
+                # Roto por un pedido anterior que ya terminó
+                pool = self._reemplazar_pool(pool)
+                futuro = asyncio.get_running_loop().run_in_executor(pool, *argumentos)
+            self.en_curso[clave] = futuro
+            futuro.add_done_callback(lambda terminado: self._terminado(clave, terminado, pool))
+        # shield: si el cliente se desconecta, el dibujo sigue para los demás
+        return await asyncio.shield(futuro), False
+
+    def _terminado(self, clave, futuro, pool):
+        del self.en_curso[clave]
+        if futuro.cancelled():
+            return
+        if futuro.exception() is None:
+            self.cache.guardar(clave, futuro.result())
+        elif isinstance(futuro.exception(), BrokenProcessPool):
+            self._reemplazar_pool(pool)
+
+    def _reemplazar_pool(self, roto):
+        """Un ProcessPoolExecutor con un trabajador muerto rechaza todo lo que
+        se le pida después: se cambia por uno nuevo (una sola vez aunque
+        fallen varios pedidos del mismo pool)."""
+        if self.pool is roto:
+            roto.shutdown(wait=False, cancel_futures=True)
+            self.pool = render.crear_pool(self.procesos, self.origen)
+            self.reinicios_pool += 1
+        return self.pool
+
+    def metricas(self):
+        return {
+            "solicitudes": self.solicitudes,
+            "errores": self.errores,
+            "segundos_activo": time.time() - self.inicio,
+            "procesos": self.procesos,
+            "reinicios_pool": self.reinicios_pool,
+            "dibujando": len(self.en_curso),
+            "cache": {
+                "entradas": len(self.cache.entradas),
+                "bytes": self.cache.bytes,
+                "max_bytes": self.cache.max_bytes,
+                "aciertos": self.cache.aciertos,
+                "fallos": self.cache.fallos,
+                "tasa_aciertos": self.cache.tasa_aciertos,
+            },
+            "latencia_ms": {tipo: _resumen_latencias(valores) for tipo, valores in self.latencias.items()},
+        }
+
+    async def resolver(self, metodo, objetivo):
+        """(estado HTTP, tipo de contenido, cuerpo) de una solicitud."""
+        if metodo != "GET":
+            return 405, "text/plain; charset=utf-8", b"Solo GET"
+        url = urlsplit(objetivo)
+        partes = [parte for parte in url.path.split("/") if parte]
+
+        if not partes:
+            indice = {
+                numero: {"archivo": nombre, "parametros": sorted(PARAMETROS.get(numero, {}))}
+                for numero, (_, nombre) in FIGURAS.items()
+            }
+            return 200, "application/json", _json({"figuras": indice, "formatos": sorted(export.FORMATOS)})
+        if partes == ["metricas"]:
+            return 200, "application/json", _json(self.metricas())
+        if len(partes) != 2 or partes[0] != "figura":
+            return 404, "text/plain; charset=utf-8", b"No encontrado"
+
+        try:
+            solicitud = self.parsear(partes[1], parse_qs(url.query))
+        except LookupError as error:
+            return 404, "text/plain; charset=utf-8", str(error).encode()
+        except ValueError as error:
+            return 400, "text/plain; charset=utf-8", str(error).encode()
+
+        inicio = time.perf_counter()
+        try:
+            datos, acierto = await self.figura(*solicitud)
+        except Exception as error:  # el trabajador falló al dibujar
+            self.errores += 1
+            return 500, "text/plain; charset=utf-8", f"{type(error).__name__}: {error}".encode()
+        self.latencias["acierto" if acierto else "fallo"].append(time.perf_counter() - inicio)
+        return 200, TIPOS_CONTENIDO[export.FORMATOS[solicitud[3]]["extension"]], datos
+
+    async def _atender(self, lector, escritor):
+        # HTTP/1.1 mínimo: solicitudes sin cuerpo y conexiones persistentes
+        try:
+            while True:
+                linea = await lector.readline()
+                if not linea:
+                    break
+                encabezados = {}
+                while True:
+                    encabezado = await lector.readline()
+                    if encabezado in (b"\r\n", b"\n", b""):
+                        break
+                    nombre, _, valor = encabezado.decode("latin-1").partition(":")
+                    encabezados[nombre.strip().lower()] = valor.strip().lower()
+
+                self.solicitudes += 1
+                try:
+                    metodo, objetivo, version = linea.decode("latin-1").split()
+                except ValueError:
+                    escritor.write(_respuesta(400, "text/plain; charset=utf-8", b"Solicitud mal formada", False))
+                    break
+                estado, tipo, cuerpo = await self.resolver(metodo, objetivo)
+                seguir = version == "HTTP/1.1" and encabezados.get("connection") != "close"
+                escritor.write(_respuesta(estado, tipo, cuerpo, seguir))
+                await escritor.drain()
+                if not seguir:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            escritor.close()
+
+
+
+def _json(datos):
+    return json.dumps(datos, ensure_ascii=False, indent=2).encode()
+
+
+def _respuesta(estado, tipo, cuerpo, seguir):
+    encabezado = (
+        f"HTTP/1.1 {estado} {RAZONES[estado]}\r\n"
+        f"Content-Type: {tipo}\r\n"
+        f"Content-Length: {len(cuerpo)}\r\n"
+        f"Connection: {'keep-alive' if seguir else 'close'}\r\n\r\n"
+    )
+    return encabezado.encode("latin-1") + cuerpo
+
+
+async def servir(host="127.0.0.1", puerto=8000, origen="states.csv", procesos=None, max_bytes=MAX_BYTES_CACHE):
+    servidor = Servidor(origen, procesos, max_bytes)
+    try:
+        sockets = await servidor.iniciar(host, puerto)
+        print(f"Sirviendo figuras en http://{host}:{puerto}/ ({servidor.procesos} procesos)")
+        async with sockets:
+            await sockets.serve_forever()
+    finally:
+        servidor.cerrar()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Servidor HTTP local que dibuja las figuras bajo pedido.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--puerto", type=int, default=8000)
+    parser.add_argument("--origen", default="states.csv")
+    parser.add_argument("--procesos", type=int, default=None)
+    parser.add_argument("--cache-mb", type=float, default=MAX_BYTES_CACHE / 1024 ** 2,
+                        help="tamaño máximo de la caché en memoria")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(servir(args.host, args.puerto, args.origen, args.procesos, int(args.cache_mb * 1024 ** 2)))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
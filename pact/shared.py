@@ -0,0 +1,95 @@
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from .artifact import codificar_columna, decodificar_columna
+
+# Traspaso del dataset procesado a los trabajadores de render.py por memoria
+# compartida, sin pasar por el CSV ni por pickle.
+#
+# publicar() copia una sola vez las columnas (codificadas igual que en el
+# artefacto: categóricas como códigos, nulos como máscara aparte) a un
+# bloque de multiprocessing.shared_memory. A los trabajadores solo les llega
+# el descriptor: nombre del bloque y, por columna, tipo, dtype y
+# desplazamiento. adjuntar() arma el DataFrame con arreglos numpy que apuntan
+# directo a ese bloque, así que todos los procesos leen las mismas páginas.
+#
+# Las columnas quedan de solo lectura en los trabajadores: las figuras pueden
+# agregar columnas (métricas), pero no modificar las publicadas.
+
+# Cada arreglo empieza en un múltiplo de este tamaño (línea de caché)
+ALINEACION = 64
+
+
+def _alinear(posicion):
+    return -(-posicion // ALINEACION) * ALINEACION
+
+
+class Publicacion:
+    """Bloque de memoria compartida con las columnas de un dataset.
+
+    Se usa como context manager; al salir el bloque se libera. Los procesos
+    que lo adjuntaron tienen que terminar antes.
+    """
+
+    def __init__(self, memoria, descriptor):
+        self.memoria = memoria
+        self.descriptor = descriptor
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excepcion):
+        self.cerrar()
+
+    @property
+    def bytes(self):
+        return self.memoria.size
+
+    def cerrar(self):
+        self.memoria.close()
+        self.memoria.unlink()
+
+
+def publicar(dataset):
+    """Copia las columnas de `dataset` a memoria compartida. Devuelve una
+    Publicacion cuyo `descriptor` se pasa a adjuntar()."""
+    columnas = []
+    arreglos = []
+    total = 0
+    for nombre in dataset.columns:
+        info, datos, mascara = codificar_columna(dataset[nombre])
+        for clave, arreglo in (("datos", datos), ("mascara", mascara)):
+            if arreglo is None:
+                continue
+            info[clave] = {"dtype": arreglo.dtype.str, "forma": arreglo.shape, "desplazamiento": total}
+            arreglos.append((total, arreglo))
+            total = _alinear(total + arreglo.nbytes)
+        columnas.append(info)
+
+    memoria = shared_memory.SharedMemory(create=True, size=max(total, 1))
+    for desplazamiento, arreglo in arreglos:
+        destino = np.ndarray(arreglo.shape, arreglo.dtype, buffer=memoria.buf, offset=desplazamiento)
+        destino[...] = arreglo
+    descriptor = {"nombre": memoria.name, "filas": len(dataset), "columnas": columnas}
+    return Publicacion(memoria, descriptor)
+
+
+def _vista(memoria, ubicacion):
+    arreglo = np.ndarray(ubicacion["forma"], np.dtype(ubicacion["dtype"]), buffer=memoria.buf,
+                         offset=ubicacion["desplazamiento"])
+    arreglo.flags.writeable = False
+    return arreglo
+
+
+def adjuntar(descriptor):
+    """(memoria, DataFrame) a partir del descriptor de publicar(). El
+    DataFrame no copia los datos: hay que conservar `memoria` mientras se use."""
+    import pandas as pd
+
+    memoria = shared_memory.SharedMemory(name=descriptor["nombre"])
+    columnas = {}
+    for info in descriptor["columnas"]:
+        mascara = _vista(memoria, info["mascara"]) if "mascara" in info else None
+        columnas[info["nombre"]] = decodificar_columna(info, _vista(memoria, info["datos"]), mascara)
+    return memoria, pd.DataFrame(columnas, copy=False)
@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+from matplotlib.collections import PolyCollection
+
+# Mapas de mosaicos (tile maps): cada unidad geográfica es un cuadro en una
+# cuadrícula. Todos los cuadros se dibujan como una sola PolyCollection con
+# los colores calculados como un arreglo, así que sirve igual para los 51
+# estados que para ~3,100 condados.
+
+# Se dibujan etiquetas solo hasta este número de cuadros; con más, el texto
+# ya no se lee y cada etiqueta es un artista aparte
+MAX_ETIQUETAS = 400
+
+
+def tabla_coordenadas(coordenadas):
+    """{'AK': (0, 7), ...} -> DataFrame indexado por clave con columnas x, y."""
+    tabla = pd.DataFrame.from_dict(coordenadas, orient="index", columns=["x", "y"])
+    tabla.index.name = "clave"
+    return tabla
+
+
+def ubicar(tabla, claves):
+    """Coordenadas de cada clave (NaN si no está en la tabla), sin ciclos."""
+    ubicadas = tabla.reindex(pd.Index(claves))
+    return ubicadas["x"].to_numpy(dtype=float), ubicadas["y"].to_numpy(dtype=float)
+
+
+def vertices_cuadros(x, y, tamano=0.8):
+    """Vértices (N, 4, 2) de cuadros de lado `tamano` centrados en (x, y)."""
+    medio = tamano / 2
+    desplazamientos = np.array([[-medio, -medio], [medio, -medio], [medio, medio], [-medio, medio]])
+    centros = np.column_stack([x, y])
+    return centros[:, None, :] + desplazamientos[None, :, :]
+
+
+def dibujar_mosaico(ax, tabla, claves, valores, cmap, norm, etiquetas=None, tamano=0.8,
+                    max_etiquetas=MAX_ETIQUETAS, fontsize=9):
+    """Dibuja un cuadro por clave coloreado según `valores`.
+
+    `tabla` es una tabla de coordenadas (ver tabla_coordenadas); las claves
+    que no aparecen en ella se omiten. `etiquetas`, si se da, es un arreglo
+    de textos alineado con `claves`; se dibujan solo si hay a lo más
+    `max_etiquetas` cuadros. Devuelve la PolyCollection.
+    """
+    x, y = ubicar(tabla, claves)
+    valores = np.asarray(valores, dtype=float)
+    visibles = ~(np.isnan(x) | np.isnan(y))
+    x, y, valores = x[visibles], y[visibles], valores[visibles]
+
+    normalizados = np.asarray(norm(valores))
+    coleccion = PolyCollection(
+        vertices_cuadros(x, y, tamano),
+        facecolors=cmap(normalizados),
+        edgecolors="white",
+        linewidths=1,
+    )
+    ax.add_collection(coleccion)
+
+    if etiquetas is not None and len(x) <= max_etiquetas:
+        etiquetas = np.asarray(etiquetas, dtype=object)[visibles]
+        # Texto blanco sobre los colores de los extremos, negro en el centro
+        colores_texto = np.where((normalizados > 0.7) | (normalizados < 0.3), "white", "black")
+        for xi, yi, texto, color in zip(x, y, etiquetas, colores_texto):
+            ax.text(xi, yi, texto, ha="center", va="center", color=color, fontsize=fontsize, fontweight="bold")
+
+    return coleccion
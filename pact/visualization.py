@@ -0,0 +1,488 @@
+# %%
+import numpy as np
+import matplotlib.pyplot as plt
+import matplotlib.colors as mcolors
+from matplotlib.ticker import PercentFormatter
+
+from . import panel
+from . import ranking
+from . import tilemap
+from .metrics import con_metricas
+from .outliers import BocetoCuantiles, marcar_outliers
+from .resampling import comparar_grupos
+from .artifact import cargar_procesado
+
+# Diccionario para mapear los nombres de los estados a sus abreviaturas de 2 letras
+us_state_to_abbrev = {
+    "Alabama": "AL", "Alaska": "AK", "Arizona": "AZ", "Arkansas": "AR", "California": "CA",
+    "Colorado": "CO", "Connecticut": "CT", "Delaware": "DE", "Florida": "FL", "Georgia": "GA",
+    "Hawaii": "HI", "Idaho": "ID", "Illinois": "IL", "Indiana": "IN", "Iowa": "IA",
+    "Kansas": "KS", "Kentucky": "KY", "Louisiana": "LA", "Maine": "ME", "Maryland": "MD",
+    "Massachusetts": "MA", "Michigan": "MI", "Minnesota": "MN", "Mississippi": "MS",
+    "Missouri": "MO", "Montana": "MT", "Nebraska": "NE", "Nevada": "NV", "New Hampshire": "NH",
+    "New Jersey": "NJ", "New Mexico": "NM", "New York": "NY", "North Carolina": "NC",
+    "North Dakota": "ND", "Ohio": "OH", "Oklahoma": "OK", "Oregon": "OR", "Pennsylvania": "PA",
+    "Rhode Island": "RI", "South Carolina": "SC", "South Dakota": "SD", "Tennessee": "TN",
+    "Texas": "TX", "Utah": "UT", "Vermont": "VT", "Virginia": "VA", "Washington": "WA",
+    "West Virginia": "WV", "Wisconsin": "WI", "Wyoming": "WY", "District of Columbia": "DC"
+}
+
+# Registro de figuras: número -> (función que dibuja, nombre del archivo).
+# Cada función recibe el dataset y devuelve la figura sin guardarla ni
+# mostrarla; render.py se encarga de eso.
+# DEPENDENCIAS lista las columnas y métricas que usa cada figura (State_Abbrev
+# sale de State); build_cache.py la usa para redibujar solo lo que cambió.
+# Las métricas se piden con con_metricas y se calculan solo si hacen falta.
+FIGURAS = {}
+DEPENDENCIAS = {}
+INTERPRETACIONES = {}
+
+# Parámetros que acepta cada figura además del dataset (nombre -> tipo), para
+# pedir variantes desde server.py; los valores por defecto dan los PNG de siempre
+PARAMETROS = {
+    5: {'top': int},
+    6: {'top': int},
+    8: {'bins': int},
+    9: {'top': int},
+}
+
+
+def cargar_datos(origen="states.csv"):
+    """Carga de datos y preparación. Se lee el artefacto columnar que deja
+    processing.py; si states.csv cambió desde entonces, se regenera solo."""
+    return preparar(cargar_procesado(origen))
+
+
+def preparar(dataset):
+    """Columnas e índices que usan las figuras, sobre un dataset ya procesado
+    (del artefacto o recién salido de pipeline.procesar_dataset)."""
+    dataset['State_Abbrev'] = dataset['State'].map(us_state_to_abbrev)
+    # Índices de ranking de las figuras 1, 5, 6 y 9 (ver ranking.py)
+    return ranking.indexar(dataset)
+
+
+def imprimir_interpretacion(numero):
+    print("\n" + "="*80)
+    for linea in INTERPRETACIONES[numero]:
+        print(linea)
+    print("="*80 + "\n")
+
+
+# %%
+# ----------------- VISUALIZACIÓN 1: TASA DE NO ASEGURADOS (BARRAS) ----------------- #
+def figura_1(dataset):
+    dataset_sorted = ranking.ordenar(dataset, 'Uninsured Rate (2015)')
+    fig = plt.figure(figsize=(15, 6))
+
+    media_uninsured = dataset['Uninsured Rate (2015)'].mean()
+    colores1 = ['red' if x > media_uninsured else '#1f77b4' for x in dataset_sorted['Uninsured Rate (2015)']]
+
+    plt.bar(dataset_sorted['State'], dataset_sorted['Uninsured Rate (2015)'], color=colores1, alpha=0.8)
+    plt.axhline(y=media_uninsured, color='red', linestyle='--', linewidth=2, label=f'Media Nacional ({media_uninsured:.1%})')
+
+    plt.title('Tasa de Personas sin Seguro en 2015 por Estado (Rojo = Sobre la Media)', fontsize=16)
+    plt.ylabel('Tasa de Personas sin Seguro (%)', fontsize=12)
+    plt.xticks(rotation=90, fontsize=8)
+    plt.gca().yaxis.set_major_formatter(PercentFormatter(1))
+    plt.legend()
+    plt.tight_layout()
+    return fig
+
+
+FIGURAS[1] = (figura_1, '01_Tasa_No_Asegurados_2015_Riesgo.png')
+DEPENDENCIAS[1] = ['State', 'Uninsured Rate (2015)']
+INTERPRETACIONES[1] = (
+    "INTERPRETACIÓN ACTUARIAL - FIGURA 1:",
+    "La gráfica muestra la penetración de mercado y el riesgo de anti-selección potencial.",
+    "Los estados en rojo (ej. Texas, Alaska) mantienen altas tasas de población sin seguro,",
+    "lo que sugiere un 'pool' de riesgo comercial más pequeño y una alta carga para la red",
+    "de salud pública por atenciones no compensadas (uncompensated care).",
+)
+
+# %%
+# ----------------- VISUALIZACIÓN 2: DEPENDENCIA DE SUBSIDIOS (DISPERSIÓN) ----------------- #
+def figura_2(dataset):
+    con_metricas(dataset, ['Subsidy Dependence Ratio'])
+    fig = plt.figure(figsize=(15, 6))
+    limite_inferior, _ = BocetoCuantiles().actualizar(dataset['Subsidy Dependence Ratio']).limites_iqr()
+
+    colores2 = np.where(marcar_outliers(dataset['Subsidy Dependence Ratio'], inferior=limite_inferior), '#d62728', '#2ca02c')
+
+    plt.scatter(dataset['State'], dataset['Subsidy Dependence Ratio'], c=colores2, s=100, alpha=0.8)
+    plt.axhline(y=limite_inferior, color='#d62728', linestyle='--', label=f'Límite Inferior ({limite_inferior:.2f})')
+
+    plt.title('Ratio de Dependencia de Subsidios en el Mercado Privado (Outliers en Rojo)', fontsize=16)
+    plt.ylabel('Proporción de Personas c/ Subsidio', fontsize=12)
+    plt.xticks(rotation=90, fontsize=8)
+    plt.legend()
+    plt.tight_layout()
+    return fig
+
+
+FIGURAS[2] = (figura_2, '02_Dependencia_Subsidios_MercadoPrivado.png')
+DEPENDENCIAS[2] = ['State', 'Subsidy Dependence Ratio']
+INTERPRETACIONES[2] = (
+    "INTERPRETACIÓN ACTUARIAL - FIGURA 2:",
+    "Evaluación de la sensibilidad tarifaria de la cartera. La mayoría de los estados",
+    "tienen entre un 80% y 90% de sus asegurados dependiendo de subsidios federales.",
+    "Desde la perspectiva de fijación de primas (pricing), esto significa que el mercado",
+    "es altamente elástico: un recorte en los créditos fiscales gubernamentales provocaría",
+    "una espiral de muerte (death spiral) inmediata, donde solo los riesgos más enfermos",
+    "se quedarían pagando la póliza completa. Los outliers en rojo tienen un riesgo menor de este fenómeno.",
+)
+
+# %%
+# ----------------- VISUALIZACIÓN 3: MAPA DE REDUCCIÓN DE NO ASEGURADOS ----------------- #
+state_coords = {
+    'AK': (0, 7),                                                                                             'ME': (11, 7),
+    'WA': (1, 6), 'ID': (2, 6), 'MT': (3, 6), 'ND': (4, 6), 'MN': (5, 6), 'IL': (6, 6), 'WI': (7, 6), 'MI': (8, 6), 'NY': (9, 6), 'VT': (10, 6), 'NH': (11, 6),
+    'OR': (1, 5), 'NV': (2, 5), 'WY': (3, 5), 'SD': (4, 5), 'IA': (5, 5), 'IN': (6, 5), 'OH': (7, 5), 'PA': (8, 5), 'NJ': (9, 5), 'CT': (10, 5), 'MA': (11, 5),
+    'CA': (1, 4), 'UT': (2, 4), 'CO': (3, 4), 'NE': (4, 4), 'MO': (5, 4), 'KY': (6, 4), 'WV': (7, 4), 'MD': (8, 4), 'DE': (9, 4), 'RI': (10, 4),
+    'AZ': (2, 3), 'NM': (3, 3), 'KS': (4, 3), 'AR': (5, 3), 'TN': (6, 3), 'VA': (7, 3), 'NC': (8, 3),
+    'OK': (4, 2), 'LA': (5, 2), 'MS': (6, 2), 'AL': (7, 2), 'SC': (8, 2), 'DC': (9, 2),
+    'HI': (0, 1), 'TX': (4, 1), 'GA': (7, 1),
+    'FL': (8, 0)
+}
+tabla_estados = tilemap.tabla_coordenadas(state_coords)
+
+
+def figura_3(dataset):
+    fig, ax = plt.subplots(figsize=(14, 8))
+    cmap = plt.cm.RdYlGn 
+
+    norm = mcolors.Normalize(vmin=dataset['Uninsured Rate Change (2010-2015)'].min(), 
+                             vmax=dataset['Uninsured Rate Change (2010-2015)'].max())
+
+    # Un solo PolyCollection para todos los cuadros (ver tilemap.py)
+    claves = dataset['State_Abbrev'].to_numpy(dtype=str)
+    valores = dataset['Uninsured Rate Change (2010-2015)'].to_numpy(dtype=float)
+    etiquetas = np.char.add(np.char.add(claves, "\n"), np.char.mod("%.1f%%", valores * 100))
+    tilemap.dibujar_mosaico(ax, tabla_estados, claves, valores, cmap.reversed(), norm, etiquetas=etiquetas)
+
+    ax.set_xlim(-1, 12)
+    ax.set_ylim(-1, 8)
+    ax.axis('off')
+    plt.title('Mapa Actuarial: Reducción en la Tasa de No Asegurados (2010-2015)\n(Verde Oscuro = Mayor Reducción de Riesgo Social)', fontsize=16)
+
+    sm = plt.cm.ScalarMappable(cmap=cmap.reversed(), norm=norm)
+    cbar = fig.colorbar(sm, ax=ax, orientation='horizontal', fraction=0.03, pad=0.04)
+    cbar.set_label('Cambio en % de Personas sin Seguro')
+    cbar.ax.xaxis.set_major_formatter(PercentFormatter(1))
+
+    plt.tight_layout()
+    return fig
+
+
+FIGURAS[3] = (figura_3, '03_Mapa_Reduccion_No_Asegurados_2010_2015.png')
+DEPENDENCIAS[3] = ['State', 'Uninsured Rate Change (2010-2015)']
+INTERPRETACIONES[3] = (
+    "INTERPRETACIÓN ACTUARIAL - FIGURA 3:",
+    "Mapa de calor del desempeño en la estabilización de los 'pools' de riesgo estatal.",
+    "Los estados en verde oscuro lograron diluir el riesgo atrayendo a personas más sanas",
+    "al sistema (Ley de Grandes Números). Los estados en rojo tuvieron el menor impacto,",
+    "manteniendo una concentración de morbilidad posiblemente más alta. Este efecto suele",
+    "estar directamente correlacionado con la decisión gubernamental de expandir Medicaid.",
+)
+
+# %%
+# ----------------- VISUALIZACIÓN 4: DISTRIBUCIÓN DEL RIESGO PÚBLICO VS PRIVADO (BOXPLOT) -----------------
+def figura_4(dataset):
+    con_metricas(dataset, ['Public vs Private Risk Index'])
+    # Separamos los estados en dos grupos: los que expandieron Medicaid y los que no
+    expansion_true = dataset[dataset['State Medicaid Expansion (2016)'] == True]['Public vs Private Risk Index'].dropna()
+    expansion_false = dataset[dataset['State Medicaid Expansion (2016)'] == False]['Public vs Private Risk Index'].dropna()
+
+    fig = plt.figure(figsize=(10, 6))
+
+    # Creamos el Boxplot
+    caja = plt.boxplot([expansion_true, expansion_false], tick_labels=['Sí (Expandió)', 'No (No Expandió)'], 
+                       patch_artist=True, widths=0.4)
+
+    # Colores y estilo
+    for box in caja['boxes']:
+        box.set_facecolor('#1f77b4')
+        box.set_alpha(0.7)
+    plt.setp(caja['medians'], color='red', linewidth=2)
+
+    # Añadimos los puntos individuales (jitter/scatter) para que se vean todos los estados.
+    # Con semilla fija: la misma figura sale igual en cada corrida
+    rng = np.random.default_rng(0)
+    for i, d in enumerate([expansion_true, expansion_false]):
+        y = d
+        x = rng.normal(i + 1, 0.04, size=len(y))
+        plt.plot(x, y, 'ro', alpha=0.6, markersize=5, label='Estados individuales' if i==0 else "")
+
+    # Diferencia de medias con IC bootstrap del 95% y p-valor de permutación (ver resampling.py)
+    # Con un subconjunto de estados (server.py) puede faltar uno de los grupos
+    if min(len(expansion_true), len(expansion_false)) < 2:
+        texto = "Diferencia de medias: n/a\n(hacen falta al menos 2 estados por grupo)"
+    else:
+        prueba = comparar_grupos(dataset, 'State Medicaid Expansion (2016)', ['Public vs Private Risk Index']).iloc[0]
+        texto = (f"Diferencia de medias: {prueba['diferencia']:.3f}\n"
+                 f"IC 95% (bootstrap): [{prueba['ic_inferior']:.3f}, {prueba['ic_superior']:.3f}]\n"
+                 f"p (permutación): {prueba['p_valor']:.4f}")
+    # Debajo del eje x, fuera del área de los datos: dentro del gráfico tapaba
+    # los estados más altos del grupo que expandió
+    plt.gca().text(
+        0.5, -0.1, texto,
+        transform=plt.gca().transAxes, ha='center', va='top', fontsize=10,
+        bbox=dict(boxstyle='round', facecolor='white', alpha=0.8),
+    )
+
+    plt.title('Distribución del Índice de Riesgo (Público vs Privado)\nSegún Expansión de Medicaid', fontsize=15)
+    plt.ylabel('Índice (Asegurados Públicos / Asegurados Privados)', fontsize=12)
+    plt.grid(axis='y', linestyle='--', alpha=0.5)
+
+    # Evitar duplicados en la leyenda
+    handles, labels = plt.gca().get_legend_handles_labels()
+    by_label = dict(zip(labels, handles))
+    plt.legend(by_label.values(), by_label.keys(), loc='upper right')
+
+    plt.tight_layout()
+    return fig
+
+
+FIGURAS[4] = (figura_4, '04_Distribucion_Riesgo_Medicaid.png')
+DEPENDENCIAS[4] = ['State Medicaid Expansion (2016)', 'Public vs Private Risk Index']
+INTERPRETACIONES[4] = (
+    "INTERPRETACIÓN ACTUARIAL - FIGURA 4:",
+    "Analiza cómo la política estatal altera la composición de la cartera de riesgo.",
+    "Un índice de 1 significa que hay 1 asegurado público por cada asegurado privado.",
+    "Los estados que expandieron Medicaid (izquierda) tienen cajas estadísticamente más altas",
+    "y dispersas, asumiendo una mayor carga de riesgo gubernamental. Los que no expandieron",
+    "mantienen el peso del riesgo principalmente en el sector comercial (primas de empleadores).",
+)
+
+# %%
+# ----------------- VISUALIZACIÓN 5: RIESGO FINANCIERO FEDERAL (BARRAS HORIZONTALES) -----------------
+def figura_5(dataset, top=15):
+    con_metricas(dataset, ['Annual Tax Credit Expenditure'])
+    # Tomamos el Top 15 de los estados que más dinero en subsidios consumen
+    top_15_gasto = ranking.top(dataset, 'Annual Tax Credit Expenditure', top)
+
+    fig = plt.figure(figsize=(12, 7))
+
+    # Gráfico de barras horizontales (se invierten [::-1] para que el mayor quede arriba)
+    barras = plt.barh(top_15_gasto['State'][::-1], top_15_gasto['Annual Tax Credit Expenditure'][::-1] / 1e9, 
+                      color='#ff7f0e', edgecolor='black', alpha=0.85)
+
+    plt.title(f'Top {len(top_15_gasto)} Estados con Mayor Gasto Anual en Subsidios (Riesgo Financiero)', fontsize=15)
+    plt.xlabel('Gasto Anual Estimado (En Miles de Millones / Billions de USD)', fontsize=12)
+    plt.ylabel('Estado', fontsize=12)
+
+    # Formato del eje X en Billones de dólares
+    plt.grid(axis='x', linestyle='--', alpha=0.5)
+
+    # Añadir el número exacto al final de cada barra
+    for bar in barras:
+        width = bar.get_width()
+        plt.text(width + 0.05, bar.get_y() + bar.get_height()/2, f"${width:.1f}B", 
+                 va='center', ha='left', fontsize=10, fontweight='bold')
+
+    plt.xlim(0, max(top_15_gasto['Annual Tax Credit Expenditure']/1e9) * 1.15)
+    plt.tight_layout()
+    return fig
+
+
+FIGURAS[5] = (figura_5, '05_Gasto_Subsidios_Top15.png')
+DEPENDENCIAS[5] = ['State', 'Annual Tax Credit Expenditure']
+INTERPRETACIONES[5] = (
+    "INTERPRETACIÓN ACTUARIAL - FIGURA 5:",
+    "Mide la exposición de riesgo del erario público. Vemos cómo estados altamente",
+    "poblados como Florida y California concentran miles de millones de dólares en",
+    "créditos fiscales anuales. Desde el punto de vista del reaseguro o de las aseguradoras",
+    "locales, estos mercados son inmensamente rentables pero están sujetos a un alto",
+    "'riesgo regulatorio': si el gobierno federal recorta fondos, estos mercados podrían colapsar.",
+)
+
+# %%
+# ----------------- VISUALIZACIÓN 6: COMPOSICIÓN DE MERCADO (BARRAS 100% APILADAS) -----------------
+def figura_6(dataset, top=10):
+    con_metricas(dataset, ['Total Insured Approx'])
+    # Elegimos los 10 estados más poblados/asegurados para ver de qué está compuesto su mercado
+    top_10_states = ranking.top(dataset, 'Total Insured Approx', top)
+
+    # Las 4 columnas que sumaremos para el 100%
+    cols = ['Employer Health Insurance Coverage (2015)', 'Marketplace Health Insurance Coverage (2016)', 
+            'Medicare Enrollment (2016)', 'Medicaid Enrollment (2016)']
+
+    labels = ['Sector Privado (Empleador)', 'Sector Privado (Marketplace)', 'Sector Público (Medicare - Edad)', 'Sector Público (Medicaid - Ingreso)']
+    colors = ['#2ca02c', '#d62728', '#1f77b4', '#9467bd']
+
+    fig, ax = plt.subplots(figsize=(12, 7))
+
+    # Variable para ir apilando las barras
+    bottom = np.zeros(len(top_10_states))
+    states = top_10_states['State'].tolist()
+
+    for i, col in enumerate(cols):
+        # Porcentaje que representa esa columna respecto al total asegurado del estado
+        percentages = top_10_states[col] / top_10_states['Total Insured Approx']
+        ax.bar(states, percentages, bottom=bottom, label=labels[i], color=colors[i], edgecolor='white', alpha=0.9)
+        bottom += percentages
+
+    ax.set_title(f'Composición de la Cartera (Market Share) - Top {len(states)} Estados Más Poblados', fontsize=15)
+    ax.set_ylabel('Porcentaje de la Población Asegurada (100%)', fontsize=12)
+
+    # Mover la leyenda afuera de la gráfica para no tapar los datos
+    ax.legend(loc='upper left', bbox_to_anchor=(1.02, 1))
+
+    # Línea del 50% como referencia
+    ax.axhline(0.5, color='black', linestyle='--', linewidth=2, alpha=0.8)
+    ax.text(len(states) - 0.5, 0.51, 'Marca del 50%', fontweight='bold', ha='right')
+
+    plt.xticks(rotation=45, ha='right')
+    plt.tight_layout()
+    return fig
+
+
+FIGURAS[6] = (figura_6, '06_Composicion_Mercado_Apiladas.png')
+DEPENDENCIAS[6] = [
+    'State',
+    'Total Insured Approx',
+    'Employer Health Insurance Coverage (2015)',
+    'Marketplace Health Insurance Coverage (2016)',
+    'Medicare Enrollment (2016)',
+    'Medicaid Enrollment (2016)',
+]
+INTERPRETACIONES[6] = (
+    "INTERPRETACIÓN ACTUARIAL - FIGURA 6:",
+    "Analiza la diversificación de fuentes de cobertura para estimar estabilidad de primas.",
+    "El color verde (Empleador) es el riesgo más estable y rentable, que domina más del 50%",
+    "del mercado en todos los estados. El bloque púrpura (Medicaid) varía enormemente;",
+    "en estados como Nueva York o California ocupa una enorme porción de su cartera, mientras",
+    "que en Texas es significativamente más bajo, lo que indica distintas prioridades de tarificación.",
+)
+
+# %%
+# ----------------- VISUALIZACIÓN 7: GRÁFICO DE PASTEL (PIE CHART) -----------------
+def figura_7(dataset):
+    # Calculamos el total nacional sumando la población de todos los estados en cada rubro
+    cols_pie = [
+        'Employer Health Insurance Coverage (2015)',
+        'Medicaid Enrollment (2016)',
+        'Medicare Enrollment (2016)',
+        'Marketplace Health Insurance Coverage (2016)'
+    ]
+    totales_nacionales = dataset[cols_pie].sum()
+
+    labels_pie = ['Sector Privado\n(Empleador)', 'Sector Público\n(Medicaid)', 'Sector Público\n(Medicare)', 'Sector Privado\n(Marketplace)']
+    colores_pie = ['#2ca02c', '#9467bd', '#1f77b4', '#d62728']
+
+    # "Explode" separa una rebanada para destacarla (en este caso el Marketplace)
+    explode = (0.05, 0.05, 0.05, 0.15)  
+
+    fig = plt.figure(figsize=(9, 9))
+    plt.pie(totales_nacionales, labels=labels_pie, colors=colores_pie, autopct='%1.1f%%', 
+            startangle=140, explode=explode, shadow=True, textprops={'fontsize': 12, 'fontweight': 'bold'})
+
+    plt.title('Distribución de Asegurados a Nivel Nacional (Mercado Total)', fontsize=16)
+    plt.tight_layout()
+    return fig
+
+
+FIGURAS[7] = (figura_7, '07_Pastel_Mercado_Nacional.png')
+DEPENDENCIAS[7] = [
+    'Employer Health Insurance Coverage (2015)',
+    'Medicaid Enrollment (2016)',
+    'Medicare Enrollment (2016)',
+    'Marketplace Health Insurance Coverage (2016)',
+]
+INTERPRETACIONES[7] = (
+    "INTERPRETACIÓN ACTUARIAL - GRÁFICO DE PASTEL:",
+    "Este gráfico resume el 'Market Share' agregado de los Estados Unidos. A nivel macro,",
+    "el sistema se sostiene gracias a las pólizas corporativas (Empleadores, >50%), que inyectan",
+    "dinero privado al sistema. Destacamos la rebanada roja (Marketplace), ya que, aunque",
+    "es la porción más pequeña del mercado, es la más volátil, la que consume más",
+    "subsidios directos y la que genera los mayores retos de tarificación individual.",
+)
+
+# %%
+# ----------------- VISUALIZACIÓN 8: HISTOGRAMA -----------------
+def figura_8(dataset, bins=12):
+    # Vemos cómo se distribuyen los 52 estados según su tasa de no asegurados
+    fig = plt.figure(figsize=(10, 6))
+
+    # Creamos el histograma con 12 "canastas" (bins)
+    counts, bins, _ = plt.hist(dataset['Uninsured Rate (2015)'], bins=bins, 
+                                     color='#17becf', edgecolor='black', alpha=0.8)
+
+    media_nacional = dataset['Uninsured Rate (2015)'].mean()
+    plt.axvline(media_nacional, color='red', linestyle='dashed', linewidth=2, 
+                label=f'Media de Estados ({media_nacional:.1%})')
+
+    plt.title('Histograma: Distribución de la Tasa de No Asegurados (2015)', fontsize=15)
+    plt.xlabel('Tasa de Personas sin Seguro (%)', fontsize=12)
+    plt.ylabel('Frecuencia (Cantidad de Estados)', fontsize=12)
+
+    # Formatear el eje X a porcentaje
+    plt.legend()
+    plt.grid(axis='y', linestyle='--', alpha=0.6)
+
+    plt.tight_layout()
+    return fig
+
+
+FIGURAS[8] = (figura_8, '08_Histograma_No_Asegurados.png')
+DEPENDENCIAS[8] = ['Uninsured Rate (2015)']
+INTERPRETACIONES[8] = (
+    "INTERPRETACIÓN ACTUARIAL - HISTOGRAMA:",
+    "El histograma revela la 'Forma de la Distribución' del riesgo país. Vemos una clara",
+    "asimetría hacia la izquierda (sesgo positivo). La mayoría de los estados (la campana más alta)",
+    "han logrado concentrar sus tasas de no asegurados entre el 5% y el 10%. Sin embargo, la",
+    "larga 'cola' hacia la derecha nos advierte de estados atípicos con problemas sistémicos",
+    "graves, superando el 15% de desprotección. Esta es una distribución no normal típica en siniestralidad.",
+)
+
+# %%
+# ----------------- VISUALIZACIÓN 9: GRÁFICO DE LÍNEAS -----------------
+def figura_9(dataset, top=5):
+    con_metricas(dataset, ['Total Insured Approx'])
+    # Seleccionamos el Top 5 de estados con mayor volumen para ver su evolución temporal
+    top_5 = ranking.top(dataset, 'Total Insured Approx', top)
+
+    fig = plt.figure(figsize=(10, 6))
+
+    # Serie años x estados desde el panel (State, Year); admite cualquier
+    # cantidad de años (ver panel.py)
+    tabla = panel.serie(panel.panel_desde_ancho(dataset), 'Uninsured Rate', estados=top_5['State'].astype(str))
+    años = tabla.index.astype(str)
+    marcadores = ['o', 's', '^', 'D', 'v']
+
+    for i, estado in enumerate(tabla.columns):
+        plt.plot(años, tabla[estado], marker=marcadores[i % len(marcadores)], markersize=8, linewidth=2.5, label=estado)
+
+    plt.title(f'Evolución (Tendencia) de la Tasa de No Asegurados ({años[0]} vs {años[-1]})\nTop {len(tabla.columns)} Estados de Mayor Volumen', fontsize=15)
+    plt.xlabel('Año', fontsize=12)
+    plt.ylabel('Tasa de Personas sin Seguro (%)', fontsize=12)
+
+    plt.legend(title='Estado', title_fontsize='12', fontsize='11', bbox_to_anchor=(1.05, 1), loc='upper left')
+    plt.grid(True, linestyle='--', alpha=0.5)
+
+    plt.tight_layout()
+    return fig
+
+
+FIGURAS[9] = (figura_9, '09_Lineas_Evolucion_Top5.png')
+DEPENDENCIAS[9] = [
+    'State',
+    'Total Insured Approx',
+    'Uninsured Rate (2010)',
+    'Uninsured Rate (2015)',
+]
+INTERPRETACIONES[9] = (
+    "INTERPRETACIÓN ACTUARIAL - GRÁFICO DE LÍNEAS:",
+    "Evaluamos la 'Tendencia Histórica' (Trend). Todas las líneas tienen una pendiente negativa,",
+    "confirmando que las reformas de salud (como el ACA) lograron su objetivo primordial",
+    "en los macro-mercados. Actuarialmente, una caída tan drástica en 5 años (como la de California)",
+    "implica un ingreso masivo de vidas nuevas al 'pool'. Estas vidas nuevas suelen traer",
+    "morbilidad desconocida o 'demanda reprimida' de servicios, lo que encarece las pólizas",
+    "en el corto plazo antes de estabilizarse.",
+)
+
+# %%
+if __name__ == "__main__":
+    # Renderiza todas las figuras sin ventanas (ver render.py)
+    from .render import main
+
+    main()
@@ -1,12 +1,25 @@
 # %%
 import matplotlib.pyplot as plt 
-import pandas as pd 
+import numpy as np
+
+from pact import profiling
+from pact.artifact import escribir_artefacto, hash_con_huella, registrar_csv
+from pact.compact import compactar
+from pact.outliers import BocetoCuantiles, marcar_outliers
+from pact.pipeline import agregar_variables_derivadas, estadisticas_imputacion, imputar, limpiar
+from pact.schema import leer_csv
 
 # %%
 # Información general del dataset 
 
-# Importamos el archivo csv
-dataset = pd.read_csv("states.csv") 
+# Importamos el archivo csv. El esquema (pact/schema.py) convierte porcentajes,
+# montos en dólares y booleanos mientras se lee el archivo.
+# Cada etapa se mide si se define PACT_TRAZA (ver pact/profiling.py)
+# El hash del archivo (para el registro del CSV y el artefacto) se toma antes de leerlo
+hash_entrada, huella = hash_con_huella("states.csv")
+with profiling.etapa("carga") as e:
+    dataset = leer_csv("states.csv", verbose=True)
+    e.filas = len(dataset)
 
 # Información de las columnas
 print("-"*20 + " INFORMACIÓN GENERAL DEL DATASET " + "-"*20)
@@ -24,41 +37,36 @@ print("\n")
 # %%
 # Limpieza de los datos y manipulación
 
-# Cambiamos los porcentajes por decimales usables
-dataset["Uninsured Rate (2010)"] = dataset["Uninsured Rate (2010)"].str.replace("%", "").astype(float) / 100
-dataset["Uninsured Rate (2015)"] = dataset["Uninsured Rate (2015)"].str.replace("%", "").astype(float) / 100
-dataset["Uninsured Rate Change (2010-2015)"] = dataset["Uninsured Rate Change (2010-2015)"].str.replace("%", "").astype(float) / 100
-
-# Cambiamos las cantidades de dolares a enteros usables
-dataset["Average Monthly Tax Credit (2016)"] = dataset["Average Monthly Tax Credit (2016)"].str.replace("$", "").astype(int)
-
-# Rellenar los valores nulos con la media de sus respectivas columnas
-dataset['Medicaid Enrollment (2013)'] = dataset['Medicaid Enrollment (2013)'].fillna(dataset['Medicaid Enrollment (2013)'].mean())
-dataset['Medicaid Enrollment Change (2013-2016)'] = dataset['Medicaid Enrollment Change (2013-2016)'].fillna(dataset['Medicaid Enrollment Change (2013-2016)'].mean())
+# Los porcentajes ya llegan como decimales y los dólares como enteros (ver pact/schema.py).
+# Quitamos los espacios al final de los nombres de los estados
+with profiling.etapa("limpieza", len(dataset)):
+    limpiar(dataset)
 
-# Para la columna booleana rellenar con la moda 
-dataset['State Medicaid Expansion (2016)'] = dataset['State Medicaid Expansion (2016)'].fillna(dataset['State Medicaid Expansion (2016)'].mode()[0])
+# Rellenar los valores nulos con la media de sus respectivas columnas y,
+# para la columna booleana, con la moda (ver IMPUTACION en pact/pipeline.py)
+with profiling.etapa("imputacion", len(dataset)):
+    imputar(dataset, estadisticas_imputacion(dataset))
 
 # Identificamos los outliers de manera visual
-plt.figure(figsize=(15, 6))
+with profiling.etapa("outliers", len(dataset)):
+    plt.figure(figsize=(15, 6))
 
-Q1 = dataset['Medicaid Enrollment (2016)'].quantile(0.25)
-Q3 = dataset['Medicaid Enrollment (2016)'].quantile(0.75)
-IQR = Q3 - Q1
-limite_superior = Q3 + 1.5 * IQR
+    # Regla IQR con el boceto de cuantiles de pact/outliers.py (exacto con pocos datos)
+    boceto = BocetoCuantiles().actualizar(dataset['Medicaid Enrollment (2016)'])
+    _, limite_superior = boceto.limites_iqr()
 
-colores = ['red' if x > limite_superior else 'blue' for x in dataset['Medicaid Enrollment (2016)']]
+    colores = np.where(marcar_outliers(dataset['Medicaid Enrollment (2016)'], superior=limite_superior), 'red', 'blue')
 
-plt.scatter(dataset['State'], dataset['Medicaid Enrollment (2016)'], c=colores, s=100, alpha=0.7)
-plt.axhline(y=limite_superior, color='r', linestyle='--', label=f'Límite de Outliers ({limite_superior:,.0f})')
+    plt.scatter(dataset['State'], dataset['Medicaid Enrollment (2016)'], c=colores, s=100, alpha=0.7)
+    plt.axhline(y=limite_superior, color='r', linestyle='--', label=f'Límite de Outliers ({limite_superior:,.0f})')
 
-plt.title('Inscripciones en Medicaid por Estado (Outliers en Rojo)', fontsize=14)
-plt.ylabel('Número de Personas Inscritas', fontsize=12)
-plt.xticks(rotation=90, fontsize=8)
-plt.legend()
-plt.tight_layout()
-plt.show()
-plt.savefig('scatter_outliers.png')
+    plt.title('Inscripciones en Medicaid por Estado (Outliers en Rojo)', fontsize=14)
+    plt.ylabel('Número de Personas Inscritas', fontsize=12)
+    plt.xticks(rotation=90, fontsize=8)
+    plt.legend()
+    plt.tight_layout()
+    plt.show()
+    plt.savefig('scatter_outliers.png')
 
 # Cambios en el dataset
 print("-"*20 + " INFORMACIÓN DEL DATASET DESPUÉS DE LOS CAMBIOS " + "-"*20)
@@ -66,31 +74,19 @@ print(dataset.info())
 print("\n")
 
 # %%
-# Variables derivadas 
-
-# 1. Aproximación de población total asegurada por estado
-dataset['Total Insured Approx'] = (
-    dataset['Employer Health Insurance Coverage (2015)'] + 
-    dataset['Marketplace Health Insurance Coverage (2016)'] + 
-    dataset['Medicaid Enrollment (2016)'] + 
-    dataset['Medicare Enrollment (2016)']
-)
-
-# 2. Índice de Riesgo Público vs Privado
-dataset['Public vs Private Risk Index'] = (
-    (dataset['Medicaid Enrollment (2016)'] + dataset['Medicare Enrollment (2016)']) / 
-    (dataset['Employer Health Insurance Coverage (2015)'] + dataset['Marketplace Health Insurance Coverage (2016)'])
-)
-
-# 3. Gasto Anual Estimado en Subsidios
-dataset['Annual Tax Credit Expenditure'] = (
-    dataset['Marketplace Tax Credits (2016)'] * dataset['Average Monthly Tax Credit (2016)'] * 12
-)
-
-# 4. Ratio de Dependencia de Subsidios en el Mercado Privado
-dataset['Subsidy Dependence Ratio'] = (
-    dataset['Marketplace Tax Credits (2016)'] / 
-    dataset['Marketplace Health Insurance Coverage (2016)']
-)
-
-dataset.to_csv("states_processed.csv", index=False)
+# Variables derivadas (definidas en pact/pipeline.py para poder aplicarlas también lote por lote)
+with profiling.etapa("metricas", len(dataset)):
+    agregar_variables_derivadas(dataset)
+
+with profiling.etapa("escritura_csv", len(dataset)):
+    dataset.to_csv("states_processed.csv", index=False)
+    registrar_csv("states_processed.csv", hash_entrada, huella)
+
+# Artefacto columnar tipado para pact/visualization.py (ver pact/artifact.py): evita
+# volver a parsear el CSV y conserva los valores exactos. Se guarda ya
+# compactado sin pérdida (enteros angostos y categóricas, ver pact/compact.py)
+# para que ocupe menos al abrirlo
+with profiling.etapa("escritura_artefacto", len(dataset)):
+    escribir_artefacto(compactar(dataset, verbose=True), hash_entrada, huella_origen=huella)
+
+profiling.volcar()
@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from pact.outliers import BocetoCuantiles
+
+CUANTILES = np.linspace(0.01, 0.99, 99)
+
+
+def error_rango(valores, estimados, q):
+    """Mayor diferencia entre el rango de cada estimado y el cuantil pedido."""
+    orden = np.sort(valores)
+    return np.abs(np.searchsorted(orden, estimados, side="right") / len(orden) - q).max()
+
+
+@pytest.fixture
+def valores():
+    return np.random.default_rng(0).lognormal(size=100_000)
+
+
+def test_exacto_con_pocos_valores():
+    datos = np.random.default_rng(1).normal(size=150)
+    boceto = BocetoCuantiles(k=200).actualizar(datos)
+    assert boceto.exacto
+    np.testing.assert_allclose(boceto.cuantil(CUANTILES), np.quantile(datos, CUANTILES))
+    assert boceto.cuantil(0.25) == pytest.approx(pd.Series(datos).quantile(0.25))
+
+
+@pytest.mark.parametrize("k", [100, 200])
+def test_error_en_rango_del_orden_de_1_sobre_k(valores, k):
+    boceto = BocetoCuantiles(k)
+    for lote in np.array_split(valores, 37):
+        boceto.actualizar(lote)
+    assert not boceto.exacto
+    assert boceto.n == len(valores)
+    # La cota del módulo es de orden 1/k; en la práctica queda debajo de 2/k
+    assert error_rango(valores, boceto.cuantil(CUANTILES), CUANTILES) <= 2 / k
+
+
+def test_fusionar_equivale_a_un_solo_boceto(valores):
+    partes = [BocetoCuantiles(semilla=i).actualizar(parte) for i, parte in enumerate(np.array_split(valores, 4))]
+    fusionado = partes[0]
+    for parte in partes[1:]:
+        fusionado.fusionar(parte)
+    assert fusionado.n == len(valores)
+    assert error_rango(valores, fusionado.cuantil(CUANTILES), CUANTILES) <= 2 / fusionado.k
+
+
+def test_ignora_nan_y_boceto_vacio():
+    assert np.isnan(BocetoCuantiles().cuantil(0.5))
+    boceto = BocetoCuantiles().actualizar([1.0, np.nan, 3.0])
+    assert boceto.n == 2
+    assert boceto.cuantil(0.5) == 2.0
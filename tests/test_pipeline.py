@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.sintetico import generar, generar_bloque
+from pact.pipeline import procesar_dataset, procesar_por_lotes
+
+MEDICAID_2013 = 'Medicaid Enrollment (2013)'
+EXPANSION = 'State Medicaid Expansion (2016)'
+# 777 no divide las filas: el último lote queda incompleto
+TAMANO_LOTE = 777
+
+
+def comparar_con_todo_en_memoria(entrada, tmp_path):
+    """Procesa `entrada` por lotes y en memoria; devuelve ambos CSV leídos."""
+    procesar_por_lotes(str(entrada), str(tmp_path / "lotes.csv"), TAMANO_LOTE)
+    procesar_dataset(str(entrada)).to_csv(tmp_path / "completo.csv", index=False)
+    por_lotes = pd.read_csv(tmp_path / "lotes.csv")
+    completo = pd.read_csv(tmp_path / "completo.csv")
+    pd.testing.assert_frame_equal(por_lotes, completo)
+    return por_lotes
+
+
+def test_por_lotes_igual_que_en_memoria(tmp_path):
+    entrada = generar(str(tmp_path / "sintetico.csv"), 5000, semilla=3)
+    crudo = pd.read_csv(entrada, dtype=str, keep_default_na=False)
+    faltantes_medicaid = (crudo[MEDICAID_2013] == "").to_numpy()
+    faltantes_expansion = (crudo[EXPANSION] == "").to_numpy()
+    assert 5000 % TAMANO_LOTE and faltantes_medicaid.any() and faltantes_expansion.any()
+
+    resultado = comparar_con_todo_en_memoria(entrada, tmp_path)
+    # Medicaid 2013 se imputa con la media de todo el archivo
+    media = pd.to_numeric(crudo.loc[~faltantes_medicaid, MEDICAID_2013]).mean()
+    np.testing.assert_allclose(resultado.loc[faltantes_medicaid, MEDICAID_2013], media)
+    assert resultado[EXPANSION].notna().all()
+
+
+@pytest.mark.parametrize("primero", ["True", "False"])
+def test_moda_con_empate_igual_que_series_mode(tmp_path, primero):
+    # Mismo número de True y False en el archivo, pero el primer lote tiene
+    # solo `primero`: la moda tiene que ser la de Series.mode (False), no la
+    # del primer lote ni la del último
+    otro = "False" if primero == "True" else "True"
+    n = 3 * TAMANO_LOTE + 100
+    bloque = generar_bloque(np.random.default_rng(0), 0, n)
+    mitad = (n - 10) // 2
+    bloque[EXPANSION] = [primero] * mitad + [otro] * mitad + [""] * (n - 2 * mitad)
+    entrada = tmp_path / "empate.csv"
+    bloque.to_csv(entrada, index=False)
+
+    resultado = comparar_con_todo_en_memoria(entrada, tmp_path)
+    assert not resultado[EXPANSION].iloc[2 * mitad:].any()
@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from pact import ranking
+
+
+def con_empates(n=500, semilla=0):
+    """Valores redondeados (muchos empates) con algunos NaN."""
+    rng = np.random.default_rng(semilla)
+    valores = rng.integers(0, 40, size=n).astype(float)
+    valores[rng.choice(n, size=n // 20, replace=False)] = np.nan
+    return valores
+
+
+def dataset_prueba(n=500, semilla=0):
+    rng = np.random.default_rng(semilla)
+    return pd.DataFrame({
+        'State': rng.choice(list("ABCDEFG"), size=n),
+        'Uninsured Rate (2015)': con_empates(n, semilla),
+    })
+
+
+@pytest.mark.parametrize("ascendente", [False, True])
+@pytest.mark.parametrize("n", [0, 1, 7, 50, 475, 500, 600])
+def test_top_n_igual_a_sort_values(n, ascendente):
+    valores = con_empates()
+    esperado = pd.Series(valores).sort_values(ascending=ascendente, kind="stable").index[:n]
+    np.testing.assert_array_equal(ranking.top_n(valores, n, ascendente), esperado)
+
+
+@pytest.mark.parametrize("ascendente", [False, True])
+def test_ordenar_y_top_igual_a_sort_values(ascendente):
+    columna = 'Uninsured Rate (2015)'
+    esperado = dataset_prueba().sort_values(columna, ascending=ascendente, kind="stable")
+    # Sin índice (selección parcial) y con índice
+    pd.testing.assert_frame_equal(ranking.top(dataset_prueba(), columna, 25, ascendente), esperado.head(25))
+    dataset = dataset_prueba()
+    pd.testing.assert_frame_equal(ranking.ordenar(dataset, columna, ascendente), esperado)
+    pd.testing.assert_frame_equal(ranking.top(dataset, columna, 25, ascendente), esperado.head(25))
+
+
+@pytest.mark.parametrize("ascendente", [False, True])
+def test_agregar_filas_mantiene_el_orden(ascendente):
+    columna = 'Uninsured Rate (2015)'
+    dataset = dataset_prueba()
+    ranking.indice(dataset, columna, ascendente)
+    combinado = ranking.agregar_filas(dataset, dataset_prueba(200, semilla=1))
+    # El índice pasa al dataset nuevo sin reconstruirse
+    assert (columna, ascendente) in ranking._indices_de(combinado)
+    esperado = combinado.sort_values(columna, ascending=ascendente, kind="stable")
+    pd.testing.assert_frame_equal(ranking.ordenar(combinado, columna, ascendente), esperado)
+
+
+@pytest.mark.parametrize("n", [1, 3, 1000])
+def test_top_por_grupo_igual_a_groupby_head(n):
+    columna = 'Uninsured Rate (2015)'
+    dataset = dataset_prueba()
+    esperado = (dataset.sort_values(columna, ascending=False, kind="stable")
+                .groupby('State').head(n)
+                .sort_values('State', kind="stable"))
+    pd.testing.assert_frame_equal(ranking.top_por_grupo(dataset, columna, 'State', n), esperado)
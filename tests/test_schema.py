@@ -0,0 +1,83 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pact.schema import _SinSimbolos, leer_csv, porcentaje_a_fraccion
+
+ESQUEMA_PRUEBA = {
+    "State": "texto",
+    "Tasa": "porcentaje",
+    "Cambio": "porcentaje",
+    "Credito": "moneda",
+    "Expansion": "booleano",
+    "Inscritos": "entero_nulo",
+    "Poblacion": "entero",
+}
+
+CSV = (
+    "State,Tasa,Cambio,Credito,Expansion,Inscritos,Poblacion\n"
+    "Alabama ,10.1%, -4.5% ,$310 ,False,799176,\"4,858,979\"\n"
+    "Alaska,14.9%,-4.2%,$750 ,,,738432\n"
+    "Arizona,10.8%, 6.9% ,$230 ,True,1201770,6828065\n"
+    "Arkansas,9.5%,0.0%,$306 ,true,556851,2978204\n"
+    "California,8.6%,-9.9%,$309 ,FALSE,7755381,39144818\n"
+)
+
+
+@pytest.fixture
+def ruta(tmp_path):
+    ruta = tmp_path / "estados.csv"
+    ruta.write_text(CSV, encoding="utf-8")
+    return str(ruta)
+
+
+def test_quita_simbolos_aunque_un_bloque_sea_solo_simbolos():
+    archivo = _SinSimbolos(io.BytesIO(b"ab%%%%$$cd$"))
+    destino = bytearray(4)
+    # "ab%%" -> "ab"; "%%$$" no deja nada pero no es el fin del archivo
+    assert archivo.readinto(destino) == 2 and destino[:2] == b"ab"
+    assert archivo.readinto(destino) == 2 and destino[:2] == b"cd"
+    assert archivo.readinto(destino) == 0
+    envuelto = io.BufferedReader(_SinSimbolos(io.BytesIO(b"1%,$2\n" + b"%" * 100 + b"3$\n")), buffer_size=8)
+    assert envuelto.read() == b"1,2\n3\n"
+
+
+def test_porcentaje_a_fraccion_exacto():
+    assert porcentaje_a_fraccion([10.1])[0] == 0.101
+    assert porcentaje_a_fraccion([-4.5])[0] == -0.045
+    # Dividir entre 100 no da el float más cercano
+    assert 10.1 / 100 != 0.101
+    porcentajes = np.round(np.arange(-300, 300) * 0.1, 1)
+    esperado = np.array([float(f"{p:.1f}e-2") for p in porcentajes])
+    np.testing.assert_array_equal(porcentaje_a_fraccion(porcentajes), esperado)
+
+
+def test_leer_csv_aplica_el_esquema(ruta):
+    dataset = leer_csv(ruta, ESQUEMA_PRUEBA)
+    assert dataset["Tasa"].tolist() == [0.101, 0.149, 0.108, 0.095, 0.086]
+    assert dataset["Cambio"].tolist() == [-0.045, -0.042, 0.069, 0.0, -0.099]
+    assert dataset["Credito"].tolist() == [310, 750, 230, 306, 309]
+    assert pd.api.types.is_integer_dtype(dataset["Credito"])
+    assert dataset["Expansion"].dtype == "boolean"
+    assert dataset["Expansion"].tolist() == [False, pd.NA, True, True, False]
+    assert dataset["Inscritos"].isna().tolist() == [False, True, False, False, False]
+    assert dataset["Inscritos"].iloc[0] == 799176
+    assert dataset["Poblacion"].dtype == "int64"
+    assert dataset["Poblacion"].iloc[0] == 4_858_979
+    # El nombre conserva sus espacios (los quita limpiar(), no el esquema)
+    assert dataset["State"].iloc[0] == "Alabama "
+
+
+def test_columnas_y_lotes_igual_que_una_lectura(ruta):
+    completo = leer_csv(ruta, ESQUEMA_PRUEBA)
+    por_lotes = pd.concat(leer_csv(ruta, ESQUEMA_PRUEBA, chunksize=2), ignore_index=True)
+    pd.testing.assert_frame_equal(por_lotes, completo)
+    parcial = leer_csv(ruta, ESQUEMA_PRUEBA, columnas=["Tasa", "Expansion"])
+    pd.testing.assert_frame_equal(parcial, completo[["Tasa", "Expansion"]])
+
+
+def test_tipo_desconocido(ruta):
+    with pytest.raises(ValueError, match="Tipo desconocido"):
+        leer_csv(ruta, {**ESQUEMA_PRUEBA, "Tasa": "fecha"})
@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from pact import shared
+
+
+def dataset_prueba():
+    return pd.DataFrame({
+        'State': pd.Categorical(["Texas", "Ohio", "Iowa", "Ohio"]),
+        'Medicaid Expansion': pd.array([True, None, False, True], dtype="boolean"),
+        'Marketplace Health Insurance Coverage (2016)': pd.array([10, None, 30, 40], dtype="Int32"),
+        'Uninsured Rate (2015)': [0.1, 0.25, np.nan, 0.05],
+        'Population': np.array([28_000_000, 11_600_000, 3_100_000, 11_600_000], dtype=np.int64),
+    })
+
+
+def test_ida_y_vuelta():
+    dataset = dataset_prueba()
+    with shared.publicar(dataset) as publicacion:
+        assert publicacion.bytes > 0
+        memoria, adjuntado = shared.adjuntar(publicacion.descriptor)
+        try:
+            pd.testing.assert_frame_equal(adjuntado, dataset)
+        finally:
+            del adjuntado
+            memoria.close()
+
+
+def test_vistas_de_solo_lectura_sobre_el_bloque():
+    with shared.publicar(dataset_prueba()) as publicacion:
+        memoria, adjuntado = shared.adjuntar(publicacion.descriptor)
+        try:
+            bloque = np.frombuffer(memoria.buf, dtype=np.uint8)
+            valores = adjuntado['Uninsured Rate (2015)'].to_numpy()
+            assert np.shares_memory(valores, bloque)
+            with pytest.raises(ValueError):
+                valores[0] = 1.0
+        finally:
+            del adjuntado, valores, bloque
+            memoria.close()
+
+
+def test_el_bloque_se_libera_al_salir():
+    with shared.publicar(dataset_prueba()) as publicacion:
+        descriptor = publicacion.descriptor
+    with pytest.raises(FileNotFoundError):
+        shared.adjuntar(descriptor)
+
+
+def test_dataset_vacio():
+    dataset = dataset_prueba().iloc[:0]
+    with shared.publicar(dataset) as publicacion:
+        memoria, adjuntado = shared.adjuntar(publicacion.descriptor)
+        try:
+            assert len(adjuntado) == 0
+            assert list(adjuntado.columns) == list(dataset.columns)
+        finally:
+            del adjuntado
+            memoria.close()